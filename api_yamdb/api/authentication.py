@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from time import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+USER_SNAPSHOT_FIELDS = ('id', 'username', 'role', 'is_staff', 'is_active')
+
+
+def get_user_cache():
+    return caches[settings.AUTH_USER_CACHE_ALIAS]
+
+
+def get_user_cache_key(user_id):
+    return f'{settings.AUTH_USER_CACHE_KEY_PREFIX}:{user_id}'
+
+
+def invalidate_user(user_id):
+    get_user_cache().delete(get_user_cache_key(user_id))
+
+
+class VerifiedTokenCache:
+    """
+    LRU-кеш проверенных токенов в памяти процесса: sha256 токена ->
+    проверенный токен и время истечения. Размер задается настройкой
+    AUTH_TOKEN_CACHE_SIZE, 0 отключает кеш. Счетчики попаданий
+    и промахов ведутся для каждого процесса отдельно.
+    """
+
+    def __init__(self):
+        self.tokens = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            item = self.tokens.get(key)
+            if item is not None and item[1] > time():
+                self.tokens.move_to_end(key)
+                self.hits += 1
+                return item[0]
+            if item is not None:
+                del self.tokens[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, token, expires):
+        with self.lock:
+            self.tokens[key] = (token, expires)
+            self.tokens.move_to_end(key)
+            while len(self.tokens) > settings.AUTH_TOKEN_CACHE_SIZE:
+                self.tokens.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.tokens.clear()
+            self.hits = self.misses = 0
+
+    def get_stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.tokens),
+            'max_size': settings.AUTH_TOKEN_CACHE_SIZE,
+        }
+
+
+verified_tokens = VerifiedTokenCache()
+
+
+class CachedUserJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса пользователя из БД на каждый запрос.
+    В кеше хранится слепок пользователя с полями, нужными для проверки
+    прав (USER_SNAPSHOT_FIELDS). Слепок не подходит для сохранения:
+    полные данные нужно загружать из БД. Запись сбрасывается сигналами
+    при изменении пользователя (api.signals).
+    Повторно присланный токен берется из verified_tokens без разбора
+    и проверки подписи, пока не истек его срок.
+    """
+
+    def get_validated_token(self, raw_token):
+        if not settings.AUTH_TOKEN_CACHE_SIZE:
+            return super().get_validated_token(raw_token)
+        key = sha256(raw_token).digest()
+        token = verified_tokens.get(key)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            verified_tokens.set(key, token, token['exp'])
+        return token
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        cache = get_user_cache()
+        key = get_user_cache_key(user_id)
+        snapshot = cache.get(key)
+        if snapshot is not None:
+            # Та же ошибка, что и при загрузке пользователя из БД.
+            if not snapshot['is_active']:
+                raise AuthenticationFailed(
+                    _('User is inactive'), code='user_inactive'
+                )
+            return self.user_model(**snapshot)
+        user = super().get_user(validated_token)
+        cache.set(
+            key,
+            {field: getattr(user, field) for field in USER_SNAPSHOT_FIELDS},
+            settings.AUTH_USER_CACHE_TIMEOUT,
+        )
+        return user
@@ -0,0 +1,211 @@
+from django.conf import settings
+from django.db import NotSupportedError, connection, transaction
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from api.cache import TITLES, invalidate
+from api.serializers import TitleBulkSerializer
+from reviews.models import Category, Genre, GenreTitle, Title
+
+ERROR_NOT_LIST = 'Ожидается список произведений.'
+ERROR_TOO_MANY = 'Не больше {limit} произведений в одном запросе.'
+ERROR_TITLE_NOT_FOUND = 'Произведение с id={id} не найдено.'
+ERROR_REPEAT_ID = 'Произведение с id={id} уже есть в запросе.'
+ERROR_REPEAT_GENRE = 'Жанр {slug} указан несколько раз.'
+ERROR_INSERTED_IDS = (
+    'Создание произведений списком не поддерживается для БД {vendor}: '
+    'она не возвращает id вставленных строк.'
+)
+
+
+def collect_slugs(items):
+    """Slug жанров и категорий из всех элементов запроса."""
+    genres, categories = set(), set()
+    for item in items:
+        genre = item.get('genre')
+        if isinstance(genre, list):
+            genres.update(slug for slug in genre if isinstance(slug, str))
+        category = item.get('category')
+        if isinstance(category, str):
+            categories.add(category)
+    return genres, categories
+
+
+def load_context(items):
+    """Все жанры и категории запроса — одним запросом на каждую модель."""
+    genres, categories = collect_slugs(items)
+    return {
+        'genres': (
+            {genre.slug: genre for genre in Genre.objects.filter(
+                slug__in=genres
+            )} if genres else {}
+        ),
+        'categories': (
+            {category.slug: category for category in Category.objects.filter(
+                slug__in=categories
+            )} if categories else {}
+        ),
+    }
+
+
+def load_titles(items):
+    """Произведения для изменения (элементы с id) одним запросом."""
+    ids = set()
+    for item in items:
+        try:
+            ids.add(int(item['id']))
+        except (KeyError, TypeError, ValueError):
+            pass
+    return Title.objects.in_bulk(ids) if ids else {}
+
+
+def get_repeat_errors(item, seen_ids):
+    """
+    Повторы id в запросе и жанров в элементе: иначе одинаковые связи
+    жанров нарушат ограничение unique_genre_title при вставке.
+    """
+    errors = {}
+    if 'id' in item:
+        title_id = int(item['id'])
+        if title_id in seen_ids:
+            errors['id'] = [ERROR_REPEAT_ID.format(id=item['id'])]
+        seen_ids.add(title_id)
+    genre = item.get('genre')
+    if isinstance(genre, list):
+        repeated = [
+            slug for slug in dict.fromkeys(
+                slug for slug in genre if isinstance(slug, str)
+            )
+            if genre.count(slug) > 1
+        ]
+        if repeated:
+            errors['genre'] = [
+                ERROR_REPEAT_GENRE.format(slug=slug) for slug in repeated
+            ]
+    return errors
+
+
+def validate_item(item, titles, context, seen_ids):
+    """Сериализатор элемента запроса и ошибки элемента ({} без ошибок)."""
+    instance = None
+    if isinstance(item, dict) and 'id' in item:
+        try:
+            instance = titles[int(item['id'])]
+        except (KeyError, TypeError, ValueError):
+            return None, {'id': [ERROR_TITLE_NOT_FOUND.format(id=item['id'])]}
+    serializer = TitleBulkSerializer(
+        instance, data=item, partial=instance is not None, context=context,
+    )
+    errors = {} if serializer.is_valid() else dict(serializer.errors)
+    if isinstance(item, dict):
+        for field, messages in get_repeat_errors(item, seen_ids).items():
+            errors.setdefault(field, messages)
+    return serializer, errors
+
+
+def validate_titles(items):
+    """
+    Проверяет все элементы запроса без обращений к БД для каждого.
+    Возвращает сериализаторы или бросает ValidationError со списком ошибок
+    по элементам ({} для корректных), как у ListSerializer.
+    """
+    if not isinstance(items, list):
+        raise serializers.ValidationError(
+            {api_settings.NON_FIELD_ERRORS_KEY: [ERROR_NOT_LIST]}
+        )
+    if len(items) > settings.TITLE_BULK_MAX_ITEMS:
+        raise serializers.ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [ERROR_TOO_MANY.format(
+                limit=settings.TITLE_BULK_MAX_ITEMS
+            )]
+        })
+    mappings = [item for item in items if isinstance(item, dict)]
+    context = load_context(mappings)
+    titles = load_titles(mappings)
+    validated, errors, seen_ids = [], [], set()
+    for item in items:
+        serializer, item_errors = validate_item(
+            item, titles, context, seen_ids
+        )
+        if not item_errors:
+            validated.append(serializer)
+        errors.append(item_errors)
+    if any(errors):
+        raise serializers.ValidationError(errors)
+    return validated
+
+
+def create_titles(titles):
+    """
+    bulk_create, после которого у произведений есть id. Django 3.2
+    возвращает id только для БД, умеющих возвращать строки из вставки
+    (PostgreSQL). На SQLite каждая пачка вставляется одним INSERT:
+    его строки получают идущие подряд rowid, последний из них
+    возвращает last_insert_rowid() этого соединения. Для остальных БД
+    id не угадываются - бросается NotSupportedError.
+    """
+    if not titles or connection.features.can_return_rows_from_bulk_insert:
+        Title.objects.bulk_create(titles)
+        return
+    if connection.vendor != 'sqlite':
+        raise NotSupportedError(
+            ERROR_INSERTED_IDS.format(vendor=connection.vendor)
+        )
+    fields = [
+        field for field in Title._meta.concrete_fields
+        if not field.primary_key
+    ]
+    batch_size = connection.ops.bulk_batch_size(fields, titles)
+    for start in range(0, len(titles), batch_size):
+        batch = titles[start:start + batch_size]
+        Title.objects.bulk_create(batch, batch_size=len(batch))
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT last_insert_rowid()')
+            last_id = cursor.fetchone()[0]
+        for pk, title in enumerate(batch, last_id - len(batch) + 1):
+            title.pk = pk
+
+
+def save_titles(validated):
+    """
+    Создает и изменяет произведения и их жанры в одной транзакции
+    через bulk_create и bulk_update. Возвращает произведения в порядке
+    элементов запроса.
+    """
+    titles, created, changed, fields = [], [], [], set()
+    for serializer in validated:
+        data = dict(serializer.validated_data)
+        data.pop('genre', None)
+        if serializer.instance is None:
+            title = Title(**data)
+            created.append(title)
+        else:
+            title = serializer.instance
+            for attr, value in data.items():
+                setattr(title, attr, value)
+            changed.append(title)
+            fields.update(data)
+        titles.append(title)
+    with transaction.atomic():
+        create_titles(created)
+        if changed and fields:
+            Title.objects.bulk_update(changed, fields)
+        replaced, links = [], []
+        for title, serializer in zip(titles, validated):
+            genres = serializer.validated_data.get('genre')
+            if genres is None:
+                continue
+            if serializer.instance is not None:
+                replaced.append(title.pk)
+            links.extend(
+                GenreTitle(title=title, genre=genre)
+                for genre in dict.fromkeys(genres)
+            )
+        if replaced:
+            GenreTitle.objects.filter(title__in=replaced).delete()
+        GenreTitle.objects.bulk_create(links)
+    invalidate(TITLES)
+    loaded = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).in_bulk([title.pk for title in titles])
+    return [loaded[title.pk] for title in titles]
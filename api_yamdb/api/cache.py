@@ -0,0 +1,228 @@
+from hashlib import md5
+from time import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+CACHE_HEADER = 'X-Cache'
+CACHE_HIT = 'HIT'
+CACHE_MISS = 'MISS'
+HITS = 'hits'
+MISSES = 'misses'
+ALL = '*'
+TITLES = 'titles'
+GENRES = 'genres'
+CATEGORIES = 'categories'
+USERS = 'users'
+
+
+def reviews_scope(title_id):
+    return f'reviews:{title_id}'
+
+
+def comments_scope(review_id):
+    return f'comments:{review_id}'
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def make_key(*parts):
+    return ':'.join((settings.RESPONSE_CACHE_KEY_PREFIX,) + parts)
+
+
+def get_generations(*scopes):
+    """
+    Поколения областей кеша входят в ключ каждого ответа этих областей.
+    Начальное значение берется от текущего времени, чтобы после вытеснения
+    счетчика из кеша не вернуться к ключам старых ответов. Счетчик живет
+    RESPONSE_CACHE_GENERATION_TIMEOUT секунд: сброс из другого процесса
+    при локальном кеше (LocMemCache) до этого процесса не доходит,
+    и устаревшие ответы и ETag живут не дольше этого времени.
+    """
+    cache = get_cache()
+    keys = [make_key('generation', scope) for scope in scopes]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(
+                key, int(time() * 1000),
+                settings.RESPONSE_CACHE_GENERATION_TIMEOUT,
+            )
+            generations[key] = cache.get(key)
+    return [str(generations[key]) for key in keys]
+
+
+def get_modified(*scopes):
+    """
+    Время последнего изменения областей кеша (для Last-Modified).
+    Если время неизвестно (ключ истек), область считается измененной сейчас.
+    """
+    cache = get_cache()
+    keys = [make_key('modified', scope) for scope in scopes]
+    modified = cache.get_many(keys)
+    for key in keys:
+        if key not in modified:
+            cache.add(
+                key, time(), settings.RESPONSE_CACHE_GENERATION_TIMEOUT
+            )
+            modified[key] = cache.get(key)
+    return max(modified.values())
+
+
+def invalidate(*scopes):
+    """Делает недоступными все закешированные ответы областей."""
+    cache = get_cache()
+    now = time()
+    cache.set_many(
+        {make_key('modified', scope): now for scope in scopes},
+        settings.RESPONSE_CACHE_GENERATION_TIMEOUT,
+    )
+    for scope in scopes:
+        try:
+            cache.incr(make_key('generation', scope))
+        except ValueError:
+            pass
+
+
+def invalidate_all():
+    """Сбрасывает все области, например после массового импорта."""
+    invalidate(ALL)
+
+
+def count(counter):
+    cache = get_cache()
+    key = make_key('stats', counter)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def get_stats():
+    cache = get_cache()
+    return {
+        counter: cache.get(make_key('stats', counter), 0)
+        for counter in (HITS, MISSES)
+    }
+
+
+def get_request_url(request):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    return f'{request.build_absolute_uri(request.path)}?{query}'
+
+
+def get_response_key(scope, request):
+    return make_key(
+        'response', scope, *get_generations(ALL, scope),
+        md5(get_request_url(request).encode()).hexdigest(),
+    )
+
+
+def get_etag(scope, request):
+    """ETag меняется вместе с поколением области и форматом ответа."""
+    source = ':'.join((
+        *get_generations(ALL, scope), get_request_url(request),
+        request.META.get('HTTP_ACCEPT', ''),
+    ))
+    return quote_etag(md5(source.encode()).hexdigest())
+
+
+class CacheScopeMixin:
+    """
+    Область кеша вьюсета: сбрасывается сигналами при изменении данных
+    (api.signals), от нее зависят ключи закешированных ответов
+    и количеств объектов для пагинации.
+    """
+    cache_scope = None
+
+    def get_cache_scope(self):
+        return self.cache_scope
+
+
+class CachedListMixin(CacheScopeMixin):
+    """
+    Кеширует ответы на GET-запросы анонимных пользователей к списку.
+    Ключ строится из области кеша вьюсета, адреса и параметров запроса.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+        cache = get_cache()
+        key = get_response_key(self.get_cache_scope(), request)
+        data = cache.get(key)
+        if data is not None:
+            count(HITS)
+            return Response(data, headers={CACHE_HEADER: CACHE_HIT})
+        count(MISSES)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response[CACHE_HEADER] = CACHE_MISS
+        return response
+
+
+class ConditionalGetMixin(CachedListMixin):
+    """
+    Отвечает 304 на If-None-Match и If-Modified-Since для списка
+    и отдельного объекта без обращения к БД и сериализации.
+    Валидаторы строятся по поколению и времени изменения области кеша,
+    поэтому перед ответом 304 проверяется, что ресурс из адреса есть.
+    Last-Modified имеет точность в секунду, поэтому пока идет секунда
+    последнего изменения, он не отдается: иначе следующее изменение
+    в ту же секунду не изменило бы его.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        scope = self.get_cache_scope()
+        etag = get_etag(scope, request)
+        last_modified = int(get_modified(ALL, scope))
+        if last_modified >= int(time()):
+            last_modified = None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None and not self.resource_exists():
+            raise Http404
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if (
+            status.is_success(response.status_code)
+            or response.status_code == status.HTTP_304_NOT_MODIFIED
+        ):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def resource_exists(self):
+        """Есть ли объект из адреса (для списка - всегда)."""
+        if not self.detail:
+            return True
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return self.get_queryset().filter(**{
+                self.lookup_field: self.kwargs[lookup_url_kwarg]
+            }).exists()
+        except (TypeError, ValueError, ValidationError):
+            return False
@@ -0,0 +1,114 @@
+from random import sample
+from time import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+KEY_SALT = 'api.codes.confirmation_code'
+
+
+def get_window(timestamp=None):
+    """Номер временного окна длиной CONFIRMATION_CODE_TIMEOUT секунд."""
+    if timestamp is None:
+        timestamp = time()
+    return int(timestamp // settings.CONFIRMATION_CODE_TIMEOUT)
+
+
+def make_code(user, window):
+    """
+    Код подтверждения - HMAC от id пользователя и окна времени.
+    Хеш пароля, email и время последнего входа входят в подпись:
+    их изменение делает выданные коды недействительными.
+    """
+    last_login = user.last_login.timestamp() if user.last_login else ''
+    value = f'{user.pk}:{user.email}:{user.password}:{last_login}:{window}'
+    number = int(salted_hmac(KEY_SALT, value).hexdigest(), 16)
+    symbols = settings.CODE_SYMBOLS
+    code = []
+    for _ in range(settings.CODE_LENGHT):
+        number, index = divmod(number, len(symbols))
+        code.append(symbols[index])
+    return ''.join(code)
+
+
+def issue_code(user):
+    """
+    Выдает код подтверждения пользователю. В режиме без хранения
+    (CONFIRMATION_CODE_STATELESS) код вычисляется и не пишется в БД.
+    """
+    if settings.CONFIRMATION_CODE_STATELESS:
+        return make_code(user, get_window())
+    user.confirmation_code = ''.join(
+        sample(settings.CODE_SYMBOLS, settings.CODE_LENGHT)
+    )
+    user.save(update_fields=('confirmation_code',))
+    return user.confirmation_code
+
+
+def get_attempts_key(user):
+    return f'{settings.CONFIRMATION_CODE_KEY_PREFIX}:attempts:{user.pk}'
+
+
+def burn_codes(user):
+    """
+    Делает недействительными все выданные коды, меняя время последнего
+    входа. Условие на прежнее значение не дает двум одновременным
+    запросам использовать один код: обновит строку только один из них.
+    """
+    now = timezone.now()
+    updated = get_user_model().objects.filter(
+        pk=user.pk, last_login=user.last_login
+    ).update(last_login=now)
+    user.last_login = now
+    return bool(updated)
+
+
+def check_stateless_code(user, code):
+    """
+    Код без хранения действует до конца следующего окна после выдачи
+    (от CONFIRMATION_CODE_TIMEOUT до удвоенного значения) и только один
+    раз. После CONFIRMATION_CODE_MAX_ATTEMPTS неверных попыток выданные
+    коды сгорают, а проверка отклоняет любые коды, пока счетчик попыток
+    не истечет (через удвоенный CONFIRMATION_CODE_TIMEOUT).
+    """
+    cache = caches[settings.CONFIRMATION_CODE_CACHE_ALIAS]
+    key = get_attempts_key(user)
+    if cache.get(key, 0) >= settings.CONFIRMATION_CODE_MAX_ATTEMPTS:
+        return False
+    window = get_window()
+    if any(
+        constant_time_compare(make_code(user, issued), code)
+        for issued in (window, window - 1)
+    ):
+        if not burn_codes(user):
+            return False
+        cache.delete(key)
+        return True
+    cache.add(key, 0, settings.CONFIRMATION_CODE_TIMEOUT * 2)
+    try:
+        attempts = cache.incr(key)
+    except ValueError:
+        return False
+    if attempts == settings.CONFIRMATION_CODE_MAX_ATTEMPTS:
+        burn_codes(user)
+    return False
+
+
+def check_code(user, code):
+    """
+    Проверяет код подтверждения. Хранимый код сбрасывается после
+    неудачной попытки.
+    """
+    if settings.CONFIRMATION_CODE_STATELESS:
+        return check_stateless_code(user, code)
+    if (
+        user.confirmation_code != settings.CODE_DEFAULT
+        and constant_time_compare(user.confirmation_code, code)
+    ):
+        return True
+    user.confirmation_code = settings.CODE_DEFAULT
+    user.save(update_fields=('confirmation_code',))
+    return False
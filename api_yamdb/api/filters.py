@@ -1,22 +1,28 @@
 import django_filters
 
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class TitleFilter(django_filters.FilterSet):
     """
     Кастомный фильтр для Произведений.
-    Решает проблему поиска по slug Жанра и Категории.
+    Жанр и категория ищутся по точному slug (уникальный индекс),
+    название и описание — по полнотекстовому индексу.
     """
-    genre = django_filters.CharFilter(
-        field_name='genre__slug', lookup_expr='contains')
-    category = django_filters.CharFilter(
-        field_name='category__slug', lookup_expr='contains')
-    name = django_filters.CharFilter(
-        field_name='name', lookup_expr='contains')
+    genre = django_filters.CharFilter(field_name='genre__slug')
+    category = django_filters.CharFilter(field_name='category__slug')
+    name = django_filters.CharFilter(method='filter_name')
+    search = django_filters.CharFilter(method='filter_search')
     year = django_filters.NumberFilter(
         field_name='year', lookup_expr='exact')
 
     class Meta:
         model = Title
-        fields = ('genre', 'category', 'name', 'year')
+        fields = ('genre', 'category', 'name', 'search', 'year')
+
+    def filter_name(self, queryset, name, value):
+        return search_titles(queryset, value, ('name',))
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value, ('name', 'description'))
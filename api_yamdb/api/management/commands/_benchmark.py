@@ -0,0 +1,179 @@
+import os
+import random
+import tempfile
+from contextlib import contextmanager
+from math import ceil
+from time import perf_counter
+
+from django.db import connection
+from django.test.utils import (CaptureQueriesContext, setup_databases,
+                               setup_test_environment, teardown_databases,
+                               teardown_test_environment)
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+from reviews.ratings import rebuild_titles_rating
+
+BATCH_SIZE = 1000
+
+
+@contextmanager
+def benchmark_database(on_disk=False):
+    """
+    Создает тестовую БД на время замера и удаляет ее после.
+    Для SQLite тестовая БД по умолчанию находится в памяти,
+    on_disk размещает ее во временном файле.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        if on_disk:
+            connection.settings_dict['TEST']['NAME'] = os.path.join(
+                directory, 'benchmark.sqlite3'
+            )
+        setup_test_environment(debug=False)
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            yield
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+
+def seed_dataset(titles, genres, categories, users, reviews_per_title,
+                 comments_per_review, seed=0):
+    """Заполняет БД синтетическими данными заданного объема."""
+    rng = random.Random(seed)
+    category_objects = [
+        Category.objects.create(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(categories)
+    ]
+    genre_objects = [
+        Genre.objects.create(name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(genres)
+    ]
+    User.objects.bulk_create(
+        (
+            User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+            for i in range(users)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    Title.objects.bulk_create(
+        (
+            Title(
+                name=f'Произведение {i}',
+                year=rng.randint(1900, 2020),
+                description=f'Описание {i}',
+                category=rng.choice(category_objects),
+            )
+            for i in range(titles)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    # SQLite не возвращает id из bulk_create, перечитываем объекты.
+    user_objects = list(User.objects.order_by('id'))
+    title_objects = list(Title.objects.order_by('id'))
+    GenreTitle.objects.bulk_create(
+        (
+            GenreTitle(title=title, genre=genre)
+            for title in title_objects
+            for genre in rng.sample(genre_objects, min(2, genres))
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    Review.objects.bulk_create(
+        (
+            Review(
+                title=title, author=author, text='Отзыв',
+                score=rng.randint(1, 10),
+            )
+            for title in title_objects
+            for author in rng.sample(
+                user_objects, min(reviews_per_title, users)
+            )
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    rebuild_titles_rating()
+    review_ids = list(Review.objects.values_list('id', flat=True))
+    Comment.objects.bulk_create(
+        (
+            Comment(
+                review_id=review_id, author=rng.choice(user_objects),
+                text='Комментарий',
+            )
+            for review_id in review_ids
+            for _ in range(comments_per_review)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    return {
+        'titles': titles,
+        'genres': genres,
+        'categories': categories,
+        'users': users,
+        'reviews': len(review_ids),
+        'comments': len(review_ids) * comments_per_review,
+    }
+
+
+def make_client(user=None):
+    client = APIClient()
+    if user is not None:
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+        )
+    return client
+
+
+def percentile(values, percent):
+    """Процентиль методом ближайшего ранга."""
+    ordered = sorted(values)
+    rank = ceil(percent / 100 * len(ordered)) - 1
+    return ordered[max(0, min(len(ordered) - 1, rank))]
+
+
+def measure(call, requests, warmup):
+    """
+    Выполняет call() warmup раз без замера, затем requests раз с замером.
+    Количество SQL-запросов считается отдельным вызовом, чтобы их запись
+    не влияла на время ответа.
+    """
+    for _ in range(warmup):
+        call()
+    with CaptureQueriesContext(connection) as context:
+        status_code = call().status_code
+    # Журнал запросов очищается в начале каждого запроса к API.
+    queries = len(context.captured_queries)
+    timings = []
+    started = perf_counter()
+    for _ in range(requests):
+        request_started = perf_counter()
+        call()
+        timings.append((perf_counter() - request_started) * 1000)
+    elapsed = perf_counter() - started
+    return {
+        'requests': requests,
+        'status': status_code,
+        'queries': queries,
+        'rps': round(requests / elapsed, 1) if elapsed else None,
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+    }
+
+
+def time_calls(call, repeat):
+    """Время одного вызова call() в мс: среднее, p50 и p95."""
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        call()
+        timings.append((perf_counter() - started) * 1000)
+    return {
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+    }
@@ -0,0 +1,156 @@
+import json
+import platform
+from itertools import count, product
+
+import django
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from api.management.commands._benchmark import (
+    benchmark_database, make_client, measure, seed_dataset)
+from api.codes import issue_code
+from reviews.models import Review, Title, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный замер API v1 на синтетических данных во временной БД. '
+        'Результат (задержки p50/p95/p99, запросов в секунду и количество '
+        'SQL-запросов по эндпоинтам) выводится в формате JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=200)
+        parser.add_argument('--genres', type=int, default=20)
+        parser.add_argument('--categories', type=int, default=5)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--reviews-per-title', type=int, default=10)
+        parser.add_argument('--comments-per-review', type=int, default=2)
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help='Количество замеряемых запросов к каждому эндпоинту.',
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=10,
+            help='Количество запросов до начала замера.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--on-disk', action='store_true',
+            help='Разместить тестовую БД SQLite в файле, а не в памяти.',
+        )
+        parser.add_argument(
+            '--output', help='Файл для результата вместо stdout.',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['titles'] < 1:
+            raise CommandError('Нужен хотя бы один запрос и произведение.')
+        # Замеряется стоимость эндпоинтов, а не ограничения частоты:
+        # сотни запросов одного клиента иначе получат ответ 429.
+        rest_framework = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': dict.fromkeys(
+                settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+            ),
+        }
+        with benchmark_database(options['on_disk']), override_settings(
+            REST_FRAMEWORK=rest_framework
+        ):
+            for cache in caches.all():
+                cache.clear()
+            dataset = seed_dataset(
+                options['titles'], options['genres'], options['categories'],
+                options['users'], options['reviews_per_title'],
+                options['comments_per_review'], options['seed'],
+            )
+            results = {
+                name: measure(call, options['requests'], options['warmup'])
+                for name, call in self.get_endpoints(options).items()
+            }
+        report = json.dumps({
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'dataset': dataset,
+            'endpoints': results,
+        }, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(report)
+        else:
+            self.stdout.write(report)
+
+    def get_endpoints(self, options):
+        """Возвращает вызовы эндпоинтов, каждый выполняет один запрос."""
+        reader = User.objects.order_by('id').first()
+        client = make_client(reader)
+        anonymous = make_client()
+        title = Title.objects.order_by('-review_count', 'id').first()
+        review = Review.objects.filter(title=title).order_by('id').first()
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        genre_slug = title.genre.values_list('slug', flat=True).first()
+
+        total = options['requests'] + options['warmup'] + 1
+        token_posts = self.get_token_posts(anonymous, total)
+        review_posts = self.get_review_posts(total)
+        return {
+            'titles_list': lambda: client.get('/api/v1/titles/'),
+            'titles_list_anonymous': lambda: anonymous.get('/api/v1/titles/'),
+            'titles_filtered': lambda: client.get(
+                '/api/v1/titles/',
+                {'genre': genre_slug, 'category': title.category.slug},
+            ),
+            'reviews_list': lambda: client.get(reviews_url),
+            'comments_list': lambda: client.get(comments_url),
+            'review_create': lambda: next(review_posts)(),
+            'comment_create': lambda: client.post(
+                comments_url, {'text': 'Комментарий'}
+            ),
+            'auth_token': lambda: next(token_posts)(),
+        }
+
+    def get_token_posts(self, client, total):
+        """
+        Готовит заранее запросы токена от новых пользователей:
+        код подтверждения действует только один раз.
+        """
+        User.objects.bulk_create(
+            User(username=f'token{number}', email=f'token{number}@yamdb.fake')
+            for number in range(total)
+        )
+        posts = [
+            lambda data=data: client.post('/api/v1/auth/token/', data)
+            for data in (
+                {
+                    'username': user.username,
+                    'confirmation_code': issue_code(user),
+                }
+                for user in User.objects.filter(username__startswith='token')
+            )
+        ]
+        return iter(posts)
+
+    def get_review_posts(self, total):
+        """
+        Готовит заранее запросы на создание отзывов от новых пользователей,
+        чтобы каждая пара автор-произведение встречалась один раз.
+        """
+        titles = list(Title.objects.values_list('id', flat=True))
+        authors = [
+            User.objects.create(
+                username=f'author{number}',
+                email=f'author{number}@yamdb.fake',
+            )
+            for number in range(-(-total // len(titles)))
+        ]
+        clients = {author.id: make_client(author) for author in authors}
+        counter = count()
+        for author, title_id in product(authors, titles):
+            client = clients[author.id]
+            url = f'/api/v1/titles/{title_id}/reviews/'
+            yield lambda client=client, url=url: client.post(url, {
+                'text': 'Отзыв', 'score': next(counter) % 10 + 1,
+            })
@@ -0,0 +1,62 @@
+import json
+import platform
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from api.management.commands._benchmark import (
+    benchmark_database, seed_dataset, time_calls)
+from api.renderers import FastJSONRenderer, orjson
+from api.serializers import TitleGetSerializer
+from api.views import TitleViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Микро-замер сериализации страницы списка произведений: время '
+        'TitleGetSerializer и рендеринга в JSON стандартным JSONRenderer '
+        'и FastJSONRenderer. Результат выводится в формате JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=100)
+        parser.add_argument('--genres', type=int, default=20)
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument(
+            '--repeat', type=int, default=200,
+            help='Количество замеров каждого этапа.',
+        )
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1 or options['page_size'] < 1:
+            raise CommandError('Нужен хотя бы один замер и объект.')
+        with benchmark_database():
+            seed_dataset(options['titles'], options['genres'], 5, 10, 1, 0)
+            page = list(
+                TitleViewSet.queryset.order_by(*TitleViewSet.ordering)
+                [:options['page_size']]
+            )
+            data = TitleGetSerializer(page, many=True).data
+            results = {
+                'serializer': time_calls(
+                    lambda: TitleGetSerializer(page, many=True).data,
+                    options['repeat'],
+                ),
+            }
+        renderers = {
+            'json_renderer': JSONRenderer(),
+            'fast_json_renderer': FastJSONRenderer(),
+        }
+        for name, renderer in renderers.items():
+            results[name] = time_calls(
+                lambda: renderer.render(data), options['repeat']
+            )
+        outputs = {renderer.render(data) for renderer in renderers.values()}
+        self.stdout.write(json.dumps({
+            'python': platform.python_version(),
+            'orjson': orjson.__version__ if orjson is not None else None,
+            'page_size': len(page),
+            'bytes': len(JSONRenderer().render(data)),
+            'identical': len(outputs) == 1,
+            'results': results,
+        }, indent=2, ensure_ascii=False))
@@ -0,0 +1,98 @@
+import json
+import platform
+
+import django
+from django.conf import settings
+from django.core.cache import caches
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from api.management.commands._benchmark import (
+    benchmark_database, seed_dataset, time_calls)
+
+# Стандартный набор middleware Django, который раньше работал для всех путей.
+DEFAULT_MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'api.middleware.QueryInstrumentationMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+PATHS = ('/api/v1/categories/', '/api/v1/titles/', '/admin/login/')
+
+
+def get_handler(middleware):
+    """Обработчик запросов с заданным набором middleware."""
+    with override_settings(MIDDLEWARE=middleware):
+        handler = BaseHandler()
+        handler.load_middleware()
+    return handler
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер накладных расходов middleware на запрос: время ответа '
+        'со стандартным набором middleware Django (before), с текущим '
+        'MIDDLEWARE (after) и для путей API без middleware (none). '
+        'Результат выводится в формате JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat', type=int, default=1000,
+            help='Количество замеряемых запросов к каждому пути.',
+        )
+        parser.add_argument(
+            '--paths', nargs='+', default=PATHS,
+            help='Замеряемые пути, ответы API берутся из кеша.',
+        )
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('Нужен хотя бы один запрос.')
+        handlers = {
+            'before': get_handler(DEFAULT_MIDDLEWARE),
+            'after': get_handler(settings.MIDDLEWARE),
+            'none': get_handler([]),
+        }
+        factory = RequestFactory()
+        results = {}
+        # Лог каждого запроса в консоль исказил бы замер.
+        with benchmark_database(), override_settings(
+            QUERY_INSTRUMENTATION_ENABLED=False
+        ):
+            for cache in caches.all():
+                cache.clear()
+            seed_dataset(20, 5, 5, 5, 1, 0)
+            for path in options['paths']:
+                names = ['before', 'after']
+                # Админка без сессий и аутентификации не работает,
+                # поэтому без middleware замеряются только пути API.
+                if path.startswith(settings.LEAN_MIDDLEWARE_PATHS):
+                    names.append('none')
+                timings = {}
+                for name in names:
+                    def call(handler=handlers[name]):
+                        return handler.get_response(factory.get(path))
+                    status_code = call().status_code
+                    timings[name] = {
+                        'status': status_code,
+                        **time_calls(call, options['repeat']),
+                    }
+                if 'none' in timings:
+                    for name in ('before', 'after'):
+                        timings[name]['overhead_ms'] = round(
+                            timings[name]['mean_ms']
+                            - timings['none']['mean_ms'], 3
+                        )
+                results[path] = timings
+        self.stdout.write(json.dumps({
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'paths': results,
+        }, indent=2, ensure_ascii=False))
@@ -0,0 +1,101 @@
+from contextlib import nullcontext
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from api.management.commands._benchmark import (
+    benchmark_database, make_client, seed_dataset)
+from reviews.models import Review, Title
+
+SQL_PREVIEW = 120
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет GET-запросы к спискам API v1 и выводит план выполнения '
+        '(EXPLAIN QUERY PLAN на SQLite) каждого SQL-запроса вьюсетов, '
+        'чтобы проверить, какие индексы они используют.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--synthetic', action='store_true',
+            help='Заполнить временную БД синтетическими данными '
+                 'вместо рабочей БД.',
+        )
+
+    def handle(self, *args, **options):
+        if options['synthetic']:
+            context = benchmark_database()
+        else:
+            context = nullcontext()
+        with context:
+            if options['synthetic']:
+                seed_dataset(200, 20, 5, 100, 10, 2)
+            for url in self.get_urls():
+                self.explain(url, options['verbosity'])
+
+    def get_urls(self):
+        urls = ['/api/v1/titles/', '/api/v1/titles/?pagination=cursor']
+        title = Title.objects.order_by('-review_count', 'id').first()
+        if title is None:
+            self.stderr.write('В БД нет произведений.')
+            return urls
+        urls.append(f'/api/v1/titles/?year={title.year}')
+        urls.append(f'/api/v1/titles/?name={title.name.split()[0]}')
+        if title.category_id is not None:
+            urls.append(f'/api/v1/titles/?category={title.category.slug}')
+        genre = title.genre.values_list('slug', flat=True).first()
+        if genre is not None:
+            urls.append(f'/api/v1/titles/?genre={genre}')
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        urls += [
+            f'/api/v1/titles/{title.id}/',
+            reviews_url,
+            f'{reviews_url}?pagination=cursor',
+        ]
+        review = Review.objects.filter(title=title).order_by('id').first()
+        if review is not None:
+            urls.append(f'{reviews_url}{review.id}/comments/')
+        return urls
+
+    def explain(self, url, verbosity):
+        for cache in caches.all():
+            cache.clear()
+        with override_settings(QUERY_INSTRUMENTATION_ENABLED=False):
+            with CaptureQueriesContext(connection) as context:
+                status_code = make_client().get(url).status_code
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].lstrip().upper().startswith('SELECT')
+        ]
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'GET {url} [{status_code}], SQL-запросов: {len(queries)}'
+        ))
+        prefix = connection.ops.explain_query_prefix()
+        with connection.cursor() as cursor:
+            for sql in queries:
+                if verbosity < 2 and len(sql) > SQL_PREVIEW:
+                    self.stdout.write(f'  {sql[:SQL_PREVIEW]}...')
+                else:
+                    self.stdout.write(f'  {sql}')
+                cursor.execute(f'{prefix} {sql}')
+                for line in self.format_plan(cursor.fetchall()):
+                    self.stdout.write(f'    {line}')
+
+    @staticmethod
+    def format_plan(rows):
+        """
+        Строки EXPLAIN QUERY PLAN SQLite (id, parent, notused, detail)
+        выводятся деревом, планы других БД — как есть.
+        """
+        if connection.vendor != 'sqlite':
+            return [' '.join(map(str, row)) for row in rows]
+        depth = {0: -1}
+        lines = []
+        for node, parent, _, detail in rows:
+            depth[node] = depth.get(parent, -1) + 1
+            lines.append('  ' * depth[node] + detail)
+        return lines
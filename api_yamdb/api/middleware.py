@@ -0,0 +1,136 @@
+import json
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.db import connections
+from django.middleware import csrf
+
+logger = logging.getLogger('api.queries')
+
+IN_LIST = re.compile(r'\(%s(?:, %s)*\)')
+
+
+class QueryRecorder:
+    """Обертка execute_wrapper: считает запросы и время их выполнения."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            self.statements.append((duration, sql))
+            self.shapes[IN_LIST.sub('(...)', sql)] += 1
+
+    def get_slowest(self, limit):
+        return [
+            {'sql': sql, 'ms': round(duration * 1000, 3)}
+            for duration, sql in sorted(self.statements, reverse=True)[:limit]
+        ]
+
+    def get_repeated(self, threshold):
+        """SQL-шаблоны, повторенные не меньше threshold раз (признак N+1)."""
+        return [
+            {'sql': sql, 'count': count}
+            for sql, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Считает SQL-запросы каждого запроса к серверу и их суммарное время.
+    Результат отдается в заголовке Server-Timing и пишется в лог
+    'api.queries' одной JSON-строкой вместе с самыми медленными
+    запросами и повторяющимися шаблонами SQL.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_INSTRUMENTATION_ENABLED:
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        repeated = recorder.get_repeated(settings.QUERY_REPEAT_THRESHOLD)
+        db_ms = round(recorder.duration * 1000, 3)
+        timing = f'db;dur={db_ms};desc="{recorder.count} queries"'
+        if repeated:
+            timing += f', n-plus-one;desc="{len(repeated)} repeated"'
+        if response.has_header('Server-Timing'):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response['Server-Timing'] = timing
+        level = logging.WARNING if repeated else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'queries': recorder.count,
+                'db_ms': db_ms,
+                'slowest': recorder.get_slowest(settings.QUERY_SLOWEST_COUNT),
+                'repeated': repeated,
+            }, ensure_ascii=False))
+        return response
+
+
+def is_lean_path(request):
+    """Путь обслуживается без сессий, сообщений и CSRF (только JWT)."""
+    return request.path_info.startswith(settings.LEAN_MIDDLEWARE_PATHS)
+
+
+class LeanPathMixin:
+    """
+    Пропускает middleware для путей из LEAN_MIDDLEWARE_PATHS. Классы
+    остаются подклассами стандартных, поэтому порядок MIDDLEWARE
+    и проверки админки (admin.E408-E410) не меняются, а для admin/
+    middleware работают как обычно.
+    """
+
+    def __call__(self, request):
+        if is_lean_path(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(LeanPathMixin, sessions.SessionMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(LeanPathMixin, csrf.CsrfViewMiddleware):
+
+    def process_view(self, request, callback, callback_args,
+                     callback_kwargs):
+        if is_lean_path(request):
+            return None
+        return super().process_view(
+            request, callback, callback_args, callback_kwargs
+        )
+
+
+class AuthenticationMiddleware(LeanPathMixin,
+                               auth.AuthenticationMiddleware):
+    """Пользователь API определяется по JWT в DRF, сессия не нужна."""
+
+
+class MessageMiddleware(LeanPathMixin, messages.MessageMiddleware):
+    pass
@@ -0,0 +1,62 @@
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
+
+
+class NestedResourceMixin:
+    """
+    Вьюсет вложенного ресурса (/titles/{title_id}/reviews/...).
+    Объекты фильтруются по всем идентификаторам родителей из адреса одним
+    запросом, без предварительной загрузки родителя. Родитель загружается
+    только при создании объекта, а для списка его существование
+    проверяется, лишь когда страница пуста, чтобы вернуть 404.
+    parent_field — поле внешнего ключа на родителя, parent_lookups —
+    соответствие аргументов адреса полям родителя.
+    """
+    parent_model = None
+    parent_field = None
+    parent_lookups = {}
+
+    def get_parent_filter(self):
+        return {
+            field: self.kwargs.get(kwarg)
+            for kwarg, field in self.parent_lookups.items()
+        }
+
+    @cached_property
+    def parent(self):
+        """Родитель из адреса, загружается не больше одного раза."""
+        return get_object_or_404(self.parent_model, **self.get_parent_filter())
+
+    def get_queryset(self):
+        return super().get_queryset().filter(**{
+            f'{self.parent_field}__{field}': value
+            for field, value in self.get_parent_filter().items()
+        })
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and not page and not self.parent_exists():
+            raise Http404
+        return page
+
+    def parent_exists(self):
+        if 'parent' in self.__dict__:
+            return True
+        return self.parent_model.objects.filter(
+            **self.get_parent_filter()
+        ).exists()
+
+    def resource_exists(self):
+        """
+        Для списка проверяется родитель, объект ищется запросом
+        с фильтром по всем родителям (ConditionalGetMixin).
+        """
+        if not self.detail:
+            return self.parent_exists()
+        return super().resource_exists()
+
+    def perform_create(self, serializer):
+        serializer.save(
+            author=self.request.user, **{self.parent_field: self.parent}
+        )
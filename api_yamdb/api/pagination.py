@@ -0,0 +1,278 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+from functools import partial
+from hashlib import md5
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from api.cache import ALL, get_cache, get_generations, make_key
+
+INVALID_CURSOR = 'Некорректный курсор.'
+INVALID_PAGE = 'Некорректный номер страницы.'
+EMPTY_PAGE = 'Страница не содержит результатов.'
+LAST_PAGE_WITHOUT_COUNT = (
+    'Последняя страница недоступна без подсчета количества (count=false).'
+)
+SKIP_COUNT_VALUES = ('0', 'false', 'no')
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу (keyset): курсор хранит значения полей сортировки
+    последнего объекта страницы, следующая страница выбирается условием
+    WHERE по этим значениям без OFFSET и без COUNT(*).
+    Сортировка берется из запроса и дополняется первичным ключом,
+    чтобы она была однозначной. NULL всегда сортируются последними.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.keys = self.get_keys(queryset)
+        queryset = queryset.order_by(*(
+            F(field.attname).desc(nulls_last=True) if descending
+            else F(field.attname).asc(nulls_last=True)
+            for field, descending in self.keys
+        ))
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+        page = list(queryset[:self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        self.page = page[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_keys(self, queryset):
+        """Возвращает пары (поле модели, по убыванию) для сортировки."""
+        opts = queryset.model._meta
+        ordering = list(queryset.query.order_by or opts.ordering or ())
+        keys = []
+        for name in ordering:
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            field = opts.pk if name == 'pk' else opts.get_field(name)
+            keys.append((field, descending))
+        if not any(field == opts.pk for field, _ in keys):
+            descending = keys[0][1] if keys else False
+            keys.append((opts.pk, descending))
+        return keys
+
+    def get_position_filter(self, position):
+        """Условие «строго после курсора» для составного ключа."""
+        condition = None
+        for (field, descending), value in reversed(
+            list(zip(self.keys, position))
+        ):
+            attname = field.attname
+            if value is None:
+                after = None
+                equal = Q(**{f'{attname}__isnull': True})
+            else:
+                lookup = 'lt' if descending else 'gt'
+                after = Q(**{f'{attname}__{lookup}': value})
+                if field.null:
+                    after |= Q(**{f'{attname}__isnull': True})
+                equal = Q(**{attname: value})
+            if condition is not None:
+                equal &= condition
+                after = equal if after is None else after | equal
+            condition = after
+        return condition if condition is not None else Q(pk__in=())
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        if not isinstance(last, dict):
+            last = last.__dict__
+        position = [last[field.attname] for field, _ in self.keys]
+        url = remove_query_param(self.request.build_absolute_uri(), 'page')
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(position)
+        )
+
+    def encode_cursor(self, position):
+        data = json.dumps(
+            position, default=lambda value: value.isoformat(),
+            separators=(',', ':'),
+        )
+        return urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(urlsafe_b64decode(
+                encoded + '=' * (-len(encoded) % 4)
+            ))
+        except (BinasciiError, UnicodeDecodeError, ValueError):
+            raise NotFound(INVALID_CURSOR)
+        if not isinstance(position, list) or len(position) != len(self.keys):
+            raise NotFound(INVALID_CURSOR)
+        try:
+            return [
+                None if value is None else field.to_python(value)
+                for (field, _), value in zip(self.keys, position)
+            ]
+        except ValidationError:
+            raise NotFound(INVALID_CURSOR)
+
+
+def get_count_key(queryset, view):
+    """
+    Ключ количества объектов: область кеша вьюсета и ее поколения
+    (сбрасываются при записи) плюс SQL запроса с параметрами фильтров.
+    Без области кеша количество не кешируется.
+    """
+    get_scope = getattr(view, 'get_cache_scope', None)
+    scope = get_scope() if get_scope is not None else None
+    if scope is None:
+        return None
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    return make_key(
+        'count', scope, *get_generations(ALL, scope),
+        md5(repr((sql, params)).encode()).hexdigest(),
+    )
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который берет COUNT(*) из кеша по ключу count_key."""
+
+    def __init__(self, object_list, per_page, count_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return super().count
+        cache = get_cache()
+        count = cache.get(self.count_key)
+        if count is None:
+            count = super().count
+            cache.set(
+                self.count_key, count, settings.PAGINATION_COUNT_TIMEOUT
+            )
+        return count
+
+
+class UncountedPaginator(Paginator):
+    """
+    Paginator без COUNT(*): читает на один объект больше размера страницы,
+    чтобы узнать, есть ли следующая. count равен числу объектов
+    до конца прочитанной части и нужен только для has_next().
+    """
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(INVALID_PAGE)
+        if number < 1:
+            raise EmptyPage(INVALID_PAGE)
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        objects = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not objects and number > 1:
+            raise EmptyPage(EMPTY_PAGE)
+        self.count = bottom + len(objects)
+        return self._get_page(objects[:self.per_page], number, self)
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    Постраничная пагинация, которая кеширует COUNT(*) до изменения данных
+    области кеша вьюсета. С параметром ?count=false количество
+    не считается: в ответе count равен null, а next и previous
+    определяются по самой странице; page=last тогда отклоняется.
+    """
+    count_query_param = 'count'
+
+    def count_skipped(self, request):
+        return (
+            request.query_params.get(self.count_query_param, '').lower()
+            in SKIP_COUNT_VALUES
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.skip_count = self.count_skipped(request)
+        if self.skip_count:
+            # Номер последней страницы требует COUNT(*).
+            if (
+                request.query_params.get(self.page_query_param)
+                in self.last_page_strings
+            ):
+                raise NotFound(LAST_PAGE_WITHOUT_COUNT)
+            self.django_paginator_class = UncountedPaginator
+        else:
+            self.django_paginator_class = partial(
+                CachedCountPaginator,
+                count_key=get_count_key(queryset, view),
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict((
+            ('count', None if self.skip_count else self.page.paginator.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        )))
+
+
+class PageNumberOrCursorPagination(CachedCountPagination):
+    """
+    Постраничная пагинация с включаемым по запросу режимом курсора:
+    ?pagination=cursor или ?cursor=<значение> переключают ответ
+    на KeysetPagination с ключами 'next' и 'results'.
+    """
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    cursor_pagination_class = KeysetPagination
+
+    def cursor_requested(self, request):
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.cursor_mode
+            or self.cursor_pagination_class.cursor_query_param
+            in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if not self.cursor_requested(request):
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = self.cursor_pagination_class()
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is None:
+            return super().get_paginated_response(data)
+        return self.cursor_paginator.get_paginated_response(data)
@@ -0,0 +1,28 @@
+from io import BytesIO
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from api.renderers import FastJSONRenderer, orjson
+
+UTF_8 = ('utf-8', 'utf8')
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser на orjson, если он установлен. Тела не в UTF-8 и JSON,
+    который orjson не принимает (NaN, Infinity), разбираются стандартным
+    JSONParser с прежними сообщениями об ошибках.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower() not in UTF_8:
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(BytesIO(body), media_type, parser_context)
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, transaction
+from django.utils.encoding import smart_str
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from api_yamdb import settings
 from reviews.models import Category, Comment, Genre, Review, Title
@@ -52,6 +54,11 @@ class TokenSerializer(serializers.Serializer):
     )
 
 
+class RefreshSerializer(serializers.Serializer):
+    """Сериализация данных для обновления токена."""
+    refresh = serializers.CharField(required=True)
+
+
 class GenreSerializer(serializers.ModelSerializer):
     """Сериализация данных для эндпоинтов Жанра."""
     class Meta:
@@ -114,6 +121,46 @@ class TitlePostSerializer(serializers.ModelSerializer):
         return data
 
 
+class PrefetchedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField, который ищет объект не запросом к БД, а в словаре
+    slug -> объект из контекста сериализатора (context_key), загруженном
+    заранее для всех элементов запроса.
+    """
+
+    def __init__(self, context_key, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        try:
+            return self.context[self.context_key][data]
+        except KeyError:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field,
+                value=smart_str(data),
+            )
+        except TypeError:
+            self.fail('invalid')
+
+
+class TitleBulkSerializer(TitlePostSerializer):
+    """
+    Проверка одного произведения из запроса к titles/bulk/:
+    жанры и категории берутся из контекста 'genres' и 'categories'.
+    """
+    genre = PrefetchedSlugRelatedField(
+        context_key='genres',
+        many=True,
+        slug_field='slug',
+        queryset=Genre.objects.all())
+    category = PrefetchedSlugRelatedField(
+        context_key='categories',
+        many=False,
+        slug_field='slug',
+        queryset=Category.objects.all())
+
+
 class ReviewSerializer(serializers.ModelSerializer):
     """Сериализация данных для эндпоинтов Отзывов."""
     author = serializers.SlugRelatedField(
@@ -126,19 +173,20 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date')
 
-    def validate(self, data):
-        """Запрещает пользователям оставлять повторные отзывы."""
-        if not self.context.get('request').method == 'POST':
-            return data
-        if Review.objects.filter(
-            author=self.context.get('request').user,
-            title=get_object_or_404(
-                Title,
-                id=self.context.get('view').kwargs.get('title_id')
+    def create(self, validated_data):
+        """
+        Запрещает пользователям оставлять повторные отзывы.
+        Повтор определяет ограничение unique_title в БД, а не отдельный
+        запрос перед вставкой, поэтому одновременные запросы не создают
+        двух отзывов.
+        """
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [ERROR_REPEAT_REVIEW]}
             )
-        ).exists():
-            raise serializers.ValidationError(ERROR_REPEAT_REVIEW)
-        return data
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -0,0 +1,104 @@
+import logging
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import invalidate_user
+from api.cache import (CATEGORIES, GENRES, TITLES, USERS, comments_scope,
+                       get_cache, invalidate, invalidate_all, reviews_scope)
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.signals import bulk_changed
+
+LOCAL_CACHE_WARNING = (
+    'Кеш ответов локален для процесса (LocMemCache): сброс из команды '
+    'не дойдет до процессов сервера, они увидят изменения не позже чем '
+    'через RESPONSE_CACHE_GENERATION_TIMEOUT секунд. Для немедленного '
+    'сброса задайте в CACHES общий бэкенд (Redis, Memcached).'
+)
+
+logger = logging.getLogger('api.cache')
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_changed(sender, **kwargs):
+    invalidate(TITLES)
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    invalidate(reviews_scope(instance.pk))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genre_changed(sender, **kwargs):
+    invalidate(GENRES, TITLES)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, **kwargs):
+    invalidate(CATEGORIES, TITLES)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    """Отзыв меняет список отзывов и рейтинг произведения."""
+    title_ids = {
+        instance.title_id, getattr(instance, '_loaded_title_id', None)
+    }
+    invalidate(TITLES, *(
+        reviews_scope(title_id) for title_id in title_ids if title_id
+    ))
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    invalidate(comments_scope(instance.pk))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    invalidate(comments_scope(instance.review_id))
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, **kwargs):
+    """Имя пользователя выводится как автор отзывов и комментариев."""
+    loaded_username = getattr(instance, '_loaded_username', None)
+    if created or loaded_username in (None, instance.username):
+        return
+    invalidate(
+        *(reviews_scope(title_id) for title_id in instance.reviews.values_list(
+            'title_id', flat=True
+        )),
+        *(comments_scope(review_id) for review_id
+          in instance.comments.values_list('review_id', flat=True)),
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_saved(sender, instance, **kwargs):
+    """Сбрасывает закешированный для JWT-аутентификации слепок."""
+    invalidate_user(instance.pk)
+    invalidate(USERS)
+
+
+@receiver(bulk_changed)
+def bulk_data_changed(sender, models, **kwargs):
+    """
+    Массовое изменение только произведений сбрасывает их область,
+    остальные модели - весь кеш: затронутые объекты неизвестны.
+    """
+    if set(models) <= {Title}:
+        invalidate(TITLES)
+    else:
+        invalidate_all()
+    if isinstance(get_cache(), LocMemCache):
+        logger.warning(LOCAL_CACHE_WARNING)
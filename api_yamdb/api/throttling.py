@@ -0,0 +1,107 @@
+from collections.abc import Mapping
+from math import ceil
+from time import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+RATE_ERROR = 'Не задана частота запросов для области {scope}.'
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket: ведро на num_requests запросов пополняется на один
+    запрос каждые duration / num_requests секунд. Состояние ведра -
+    одно число в кеше, время (мс), к которому ведро снова заполнится
+    (GCRA). Оно меняется только атомарными add, incr и decr, поэтому
+    одновременные запросы не проходят сверх лимита, а к БД throttle
+    не обращается. Частота None отключает ограничение.
+    """
+
+    def __init__(self):
+        self.cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        super().__init__()
+
+    def get_rate(self):
+        """Частоты читаются из настроек при каждом запросе."""
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(RATE_ERROR.format(scope=self.scope))
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        now = int(time() * 1000)
+        interval = self.duration * 1000 // self.num_requests or 1
+        capacity = interval * self.num_requests
+        if self.cache.add(self.key, now + interval, ceil(interval / 1000)):
+            return True
+        try:
+            filled_at = self.cache.incr(self.key, interval)
+        except ValueError:
+            # Ключ истек между add и incr: ведро снова полное.
+            self.cache.add(self.key, now + interval, ceil(interval / 1000))
+            return True
+        stale = now + interval - filled_at
+        if stale > 0:
+            # Ключ пережил момент заполнения ведра: время истечения
+            # в кеше задается с точностью до секунды.
+            filled_at = self.cache.incr(self.key, stale)
+        if filled_at - now > capacity:
+            try:
+                self.cache.decr(self.key, interval)
+            except ValueError:
+                pass
+            self.wait_ms = filled_at - now - capacity
+            return False
+        self.cache.touch(self.key, max(1, ceil((filled_at - now) / 1000)))
+        return True
+
+    def wait(self):
+        return self.wait_ms / 1000
+
+
+class SignupThrottle(TokenBucketThrottle):
+    """Запросы кода подтверждения с одного адреса."""
+    scope = 'signup'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope, 'ident': self.get_ident(request),
+        }
+
+
+class TokenAttemptThrottle(TokenBucketThrottle):
+    """Попытки получить токен для одного имени пользователя."""
+    scope = 'token'
+
+    def get_cache_key(self, request, view):
+        username = None
+        # Тело может быть списком или строкой: его проверит сериализатор.
+        if isinstance(request.data, Mapping):
+            username = request.data.get('username')
+        if not isinstance(username, str) or not username:
+            username = self.get_ident(request)
+        return self.cache_format % {
+            'scope': self.scope, 'ident': username.lower(),
+        }
+
+
+class ReviewWriteThrottle(TokenBucketThrottle):
+    """Создание и изменение отзывов и комментариев одним пользователем."""
+    scope = 'review_write'
+
+    def get_cache_key(self, request, view):
+        if request.method in SAFE_METHODS or not request.user.is_authenticated:
+            return None
+        return self.cache_format % {
+            'scope': self.scope, 'ident': request.user.pk,
+        }
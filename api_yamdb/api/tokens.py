@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+TOKEN_DENIED = 'Токен отозван.'
+
+
+def get_denylist():
+    return caches[settings.TOKEN_DENYLIST_CACHE_ALIAS]
+
+
+class DenylistRefreshToken(RefreshToken):
+    """
+    Refresh-токен со списком отозванных токенов в кеше вместо таблиц
+    приложения token_blacklist: выдача токена ничего не пишет в БД,
+    проверка - одно чтение из кеша. Запись хранится, пока не истечет
+    срок действия самого токена.
+    """
+
+    def get_denylist_key(self):
+        return (
+            f'{settings.TOKEN_DENYLIST_KEY_PREFIX}:'
+            f'{self.payload[jwt_settings.JTI_CLAIM]}'
+        )
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        if (
+            jwt_settings.BLACKLIST_AFTER_ROTATION
+            and get_denylist().get(self.get_denylist_key()) is not None
+        ):
+            raise TokenError(TOKEN_DENIED)
+
+    def deny(self):
+        """
+        Отзывает токен. cache.add атомарен, поэтому при одновременном
+        обновлении одним токеном новую пару получит только один запрос.
+        """
+        timeout = max(
+            1, int(self.payload['exp'] - self.current_time.timestamp())
+        )
+        if not get_denylist().add(self.get_denylist_key(), 1, timeout):
+            raise TokenError(TOKEN_DENIED)
+
+
+def get_token_pair(user):
+    refresh = DenylistRefreshToken.for_user(user)
+    return {'token': str(refresh.access_token), 'refresh': str(refresh)}
+
+
+def refresh_token_pair(raw_token):
+    """
+    Выдает новый access-токен по refresh-токену. При ROTATE_REFRESH_TOKENS
+    выдается и новый refresh-токен, а при BLACKLIST_AFTER_ROTATION старый
+    отзывается. Ошибки проверки токена - TokenError.
+    """
+    refresh = DenylistRefreshToken(raw_token)
+    data = {'token': str(refresh.access_token)}
+    if jwt_settings.ROTATE_REFRESH_TOKENS:
+        if jwt_settings.BLACKLIST_AFTER_ROTATION:
+            refresh.deny()
+        refresh.set_jti()
+        refresh.set_exp()
+        refresh.set_iat()
+        data['refresh'] = str(refresh)
+    return data
@@ -3,8 +3,8 @@ from rest_framework import routers
 
 from api.views import (
     CategoryViewSet, CommentViewSet, GenreViewSet,
-    ReviewViewSet, TitleViewSet, UserViewSet, get_token,
-    signup
+    ReviewViewSet, TitleViewSet, UserViewSet, cache_stats, export_table,
+    get_token, refresh_token, signup, token_cache_stats
 )
 
 v1_router = routers.DefaultRouter()
@@ -24,10 +24,22 @@ v1_router.register('users', UserViewSet, basename='users')
 
 auth_path = [
     path('auth/signup/', signup),
-    path('auth/token/', get_token)
+    path('auth/token/', get_token),
+    path('auth/token/refresh/', refresh_token),
+]
+
+stats_path = [
+    path('stats/cache/', cache_stats),
+    path('stats/tokens/', token_cache_stats),
+]
+
+export_path = [
+    path('export/<str:table>/', export_table),
 ]
 
 urlpatterns = [
     path('v1/', include(v1_router.urls)),
-    path('v1/', include(auth_path))
+    path('v1/', include(auth_path)),
+    path('v1/', include(stats_path)),
+    path('v1/', include(export_path)),
 ]
@@ -0,0 +1,117 @@
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from reviews.models import GenreTitle
+
+DATETIME = serializers.DateTimeField()
+RATING = serializers.IntegerField()
+
+
+class ValuesSerializer:
+    """
+    Сериализатор списка только для чтения: строит ответ из строк
+    .values() без создания объектов моделей и полей DRF на каждую строку.
+    columns — поля ответа в порядке вывода: (имя, путь в values(),
+    функция преобразования или None), extra_lookups — другие нужные
+    пути. Результат должен совпадать с ответом обычного сериализатора
+    вьюсета.
+    """
+    columns = ()
+    extra_lookups = ()
+
+    def get_queryset(self, queryset):
+        """
+        Кроме полей ответа выбираются все поля модели: по ним
+        KeysetPagination строит курсор следующей страницы.
+        """
+        attnames = [
+            field.attname for field in queryset.model._meta.concrete_fields
+        ]
+        lookups = [lookup for _, lookup, _ in self.columns]
+        return queryset.prefetch_related(None).values(
+            *dict.fromkeys(attnames + lookups + list(self.extra_lookups))
+        )
+
+    def to_representation(self, row):
+        data = {}
+        for name, lookup, to_representation in self.columns:
+            value = row[lookup]
+            if value is not None and to_representation is not None:
+                value = to_representation(value)
+            data[name] = value
+        return data
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+class TitleValuesSerializer(ValuesSerializer):
+    """Ответ TitleGetSerializer: жанры загружаются одним запросом."""
+    columns = (
+        ('id', 'id', None),
+        ('name', 'name', None),
+        ('year', 'year', None),
+        ('description', 'description', None),
+        ('genre', 'id', None),
+        ('category', 'category_id', None),
+        ('rating', 'rating', RATING.to_representation),
+    )
+    extra_lookups = ('category__name', 'category__slug')
+
+    def serialize(self, rows):
+        genres = {row['id']: [] for row in rows}
+        links = GenreTitle.objects.filter(
+            title_id__in=genres, genre__isnull=False,
+        ).values_list('title_id', 'genre__name', 'genre__slug')
+        for title_id, name, slug in links:
+            genres[title_id].append({'name': name, 'slug': slug})
+        data = super().serialize(rows)
+        for row, title in zip(rows, data):
+            title['genre'] = genres[row['id']]
+            if title['category'] is not None:
+                title['category'] = {
+                    'name': row['category__name'],
+                    'slug': row['category__slug'],
+                }
+        return data
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """Ответ ReviewSerializer."""
+    columns = (
+        ('id', 'id', None),
+        ('text', 'text', None),
+        ('author', 'author__username', None),
+        ('score', 'score', None),
+        ('pub_date', 'pub_date', DATETIME.to_representation),
+    )
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    """Ответ CommentSerializer."""
+    columns = (
+        ('id', 'id', None),
+        ('text', 'text', None),
+        ('author', 'author__username', None),
+        ('pub_date', 'pub_date', DATETIME.to_representation),
+    )
+
+
+class ValuesListMixin:
+    """
+    Отдает GET-список через values_serializer_class, если он задан
+    во вьюсете. Остальные действия используют обычный сериализатор.
+    """
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+        serializer = self.values_serializer_class()
+        queryset = serializer.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(queryset))
@@ -1,32 +1,51 @@
-from random import sample
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
 from django.db import IntegrityError
-from django.db.models import Avg
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, serializers, status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.decorators import (action, api_view, permission_classes,
+                                       throttle_classes)
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 
 from api_yamdb import settings
 
+from api.authentication import verified_tokens
+from api.bulk import save_titles, validate_titles
+from api.cache import (
+    CATEGORIES, GENRES, TITLES, USERS, CachedListMixin, CacheScopeMixin,
+    ConditionalGetMixin, comments_scope, get_stats, reviews_scope,
+)
+from api.codes import check_code, issue_code
+from api.filters import TitleFilter
+from api.nested import NestedResourceMixin
+from api.pagination import (
+    CachedCountPagination, PageNumberOrCursorPagination,
+)
 from api.permissions import (
     IsAdmin, IsAdminOrReadOnly,
     IsOwnerAdminModeratorOrReadOnly,
 )
-from api.filters import TitleFilter
 from api.serializers import (
     CategorySerializer, CommentSerializer,
-    GenreSerializer, ReviewSerializer,
+    GenreSerializer, RefreshSerializer, ReviewSerializer,
     SignupSerializer, TitleGetSerializer,
     TitlePostSerializer, TokenSerializer,
     UserSerializer,
 )
-from reviews.models import Category, Genre, Review, Title
+from api.throttling import (
+    ReviewWriteThrottle, SignupThrottle, TokenAttemptThrottle,
+)
+from api.tokens import get_token_pair, refresh_token_pair
+from api.values import (
+    CommentValuesSerializer, ReviewValuesSerializer, TitleValuesSerializer,
+    ValuesListMixin,
+)
+from reviews.export import CSV, FORMATS, JSONL, TABLES, export_lines
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.outbox import queue_mail
 
 User = get_user_model()
 
@@ -34,9 +53,14 @@ EMAIL_HEADER = 'Код подтверждения регистрации на п
 EMAIL_TEXT = 'Ваш одноразовый код подтверждения: {confirmation_code}.'
 USER_ERROR = 'Данные имя пользователя или Email уже зарегистрированы.'
 CODE_ERROR = 'Введен неверный код подтверждения. Запросите новый код.'
+EXPORT_FORMAT_ERROR = 'Допустимые форматы: {formats}.'
+EXPORT_CONTENT_TYPES = {
+    CSV: 'text/csv; charset=utf-8',
+    JSONL: 'application/x-ndjson; charset=utf-8',
+}
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(CacheScopeMixin, viewsets.ModelViewSet):
     """
     Администратор получает список пользователей, может создавать,
     удалять, редактировать пользователя. Пользователь по url 'users/me/'
@@ -49,12 +73,13 @@ class UserViewSet(viewsets.ModelViewSet):
     search_fields = ('username',)
     lookup_field = 'username'
     http_method_names = ('get', 'post', 'patch', 'delete')
-    pagination_class = PageNumberPagination
+    pagination_class = CachedCountPagination
+    cache_scope = USERS
 
     @action(methods=('get', 'patch'), detail=False, url_path='me',
             permission_classes=(IsAuthenticated,))
     def user_owner(self, request):
-        user = request.user
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'GET':
             return Response(
                 self.get_serializer(user).data,
@@ -69,6 +94,7 @@ class UserViewSet(viewsets.ModelViewSet):
 
 @api_view(['POST'])
 @permission_classes((AllowAny,))
+@throttle_classes((SignupThrottle,))
 def signup(request):
     """
     Пользователь отправляет свои 'username' и 'email' на 'auth/signup/ и
@@ -83,116 +109,177 @@ def signup(request):
                                                    email=email)
     except IntegrityError:
         raise serializers.ValidationError(USER_ERROR)
-    confirmation_code = ''.join(sample(
-        settings.CODE_SYMBOLS,
-        settings.CODE_LENGHT
-    ))
-    send_mail(
+    queue_mail(
         EMAIL_HEADER,
-        EMAIL_TEXT.format(confirmation_code=confirmation_code),
+        EMAIL_TEXT.format(confirmation_code=issue_code(user)),
         settings.ADMIN_EMAIL,
-        [user.email],
+        user.email,
     )
-    user.confirmation_code = confirmation_code
-    user.save()
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
 @permission_classes((AllowAny,))
+@throttle_classes((TokenAttemptThrottle,))
 def get_token(request):
     """
     Пользователь отправляет свои 'username' и 'confirmation_code'
-    на 'auth/token/ и получает токен.
+    на 'auth/token/ и получает токен и refresh-токен.
     """
     serializer = TokenSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
     user = get_object_or_404(User, username=request.data['username'])
-    if (
-        user.confirmation_code != settings.CODE_DEFAULT
-        and user.confirmation_code == serializer.data['confirmation_code']
-    ):
-        return Response(
-            {'token': str(AccessToken.for_user(user))},
-            status=status.HTTP_201_CREATED
-        )
-    user.confirmation_code = settings.CODE_DEFAULT
-    user.save()
+    if check_code(user, serializer.data['confirmation_code']):
+        return Response(get_token_pair(user), status=status.HTTP_201_CREATED)
     raise serializers.ValidationError(CODE_ERROR)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+@api_view(['POST'])
+@permission_classes((AllowAny,))
+def refresh_token(request):
+    """
+    Пользователь отправляет 'refresh' на 'auth/token/refresh/' и получает
+    новый токен без повторного запроса кода подтверждения.
+    """
+    serializer = RefreshSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    try:
+        data = refresh_token_pair(serializer.validated_data['refresh'])
+    except TokenError as error:
+        raise InvalidToken(error.args[0])
+    return Response(data, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes((IsAdmin,))
+def cache_stats(request):
+    """Администратор получает счетчики попаданий и промахов кеша ответов."""
+    return Response(get_stats(), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes((IsAdmin,))
+def token_cache_stats(request):
+    """
+    Администратор получает счетчики кеша проверенных токенов
+    процесса, обработавшего запрос.
+    """
+    return Response(verified_tokens.get_stats(), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes((IsAdmin,))
+def export_table(request, table):
+    """
+    Администратор выгружает таблицу потоком в CSV (формат import_csv)
+    или JSON Lines (?type=jsonl), записи читаются из БД пачками.
+    """
+    if table not in TABLES:
+        raise Http404
+    file_format = request.query_params.get('type', CSV)
+    if file_format not in FORMATS:
+        raise serializers.ValidationError(
+            {'type': [EXPORT_FORMAT_ERROR.format(formats=', '.join(FORMATS))]}
+        )
+    response = StreamingHttpResponse(
+        export_lines(table, file_format),
+        content_type=EXPORT_CONTENT_TYPES[file_format],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{table}.{file_format}"'
+    )
+    return response
+
+
+class ReviewViewSet(NestedResourceMixin, ConditionalGetMixin,
+                    ValuesListMixin, viewsets.ModelViewSet):
     """
     Вьюсет для обработки эндпоинтов:
     GET DETAIL, GET LIST, POST, PATCH, DELETE
-    /titles/{title_id}/reviews/{review_id}/comments/,
-    /titles/{titles_id}/reviews/{review_id}/comments/{comment_id}/
+    /titles/{title_id}/reviews/,
+    /titles/{title_id}/reviews/{review_id}/
     """
+    queryset = Review.objects.select_related('author')
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
     permission_classes = (IsOwnerAdminModeratorOrReadOnly,)
+    pagination_class = PageNumberOrCursorPagination
+    throttle_classes = (ReviewWriteThrottle,)
+    parent_model = Title
+    parent_field = 'title'
+    parent_lookups = {'title_id': 'id'}
 
-    def get_title(self):
-        return get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id'),
-        )
-
-    def get_queryset(self):
-        return self.get_title().reviews.select_related('title', 'author')
-
-    def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+    def get_cache_scope(self):
+        return reviews_scope(self.kwargs.get('title_id'))
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(NestedResourceMixin, ConditionalGetMixin,
+                     ValuesListMixin, viewsets.ModelViewSet):
     """
     Вьюсет для обработки эндпоинтов:
     GET DETAIL, GET LIST, POST, PATCH, DELETE
     /titles/{title_id}/reviews/{review_id}/comments/,
     /titles/{titles_id}/reviews/{review_id}/comments/{comment_id}/
     """
+    queryset = Comment.objects.select_related('author')
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
     permission_classes = (IsOwnerAdminModeratorOrReadOnly,)
+    pagination_class = PageNumberOrCursorPagination
+    throttle_classes = (ReviewWriteThrottle,)
+    parent_model = Review
+    parent_field = 'review'
+    parent_lookups = {'review_id': 'id', 'title_id': 'title_id'}
 
-    def get_review(self):
-        return get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
-        )
-
-    def get_queryset(self):
-        return self.get_review().comments.select_related('review', 'author')
+    def get_cache_scope(self):
+        return comments_scope(self.kwargs.get('review_id'))
 
-    def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
 
-
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ConditionalGetMixin, ValuesListMixin,
+                   viewsets.ModelViewSet):
     """
     Вьюсет для обработки эндпоинтов:
     GET DETAIL, GET LIST, POST, PATCH, DELETE
     /titles/, /titles/{titles_id}/
     """
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    )
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
-    ordering = ('-rating',)
+    ordering = ('-rating', 'name')
     ordering_fields = ('rating', 'category', 'name', 'year')
     filterset_class = TitleFilter
     http_method_names = ('get', 'post', 'patch', 'delete')
-    pagination_class = PageNumberPagination
+    pagination_class = PageNumberOrCursorPagination
     permission_classes = (IsAdminOrReadOnly,)
+    cache_scope = TITLES
+    values_serializer_class = TitleValuesSerializer
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
             return TitleGetSerializer
         return TitlePostSerializer
 
+    @action(methods=('post',), detail=False, url_path='bulk')
+    def bulk(self, request):
+        """
+        Создает (элементы без id) и изменяет (элементы с id) список
+        произведений. При ошибке хотя бы в одном элементе ничего
+        не сохраняется, в ответе — ошибки по каждому элементу.
+        """
+        validated = validate_titles(request.data)
+        titles = save_titles(validated)
+        created = any(serializer.instance is None for serializer in validated)
+        return Response(
+            TitlePostSerializer(titles, many=True).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+
 
-class CategoryGenreBaseViewSet(mixins.CreateModelMixin,
+class CategoryGenreBaseViewSet(CachedListMixin,
+                               mixins.CreateModelMixin,
                                mixins.ListModelMixin,
                                mixins.DestroyModelMixin,
                                viewsets.GenericViewSet):
@@ -202,7 +289,7 @@ class CategoryGenreBaseViewSet(mixins.CreateModelMixin,
     """
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
-    pagination_class = PageNumberPagination
+    pagination_class = CachedCountPagination
     lookup_field = 'slug'
     permission_classes = (IsAdminOrReadOnly,)
 
@@ -215,6 +302,7 @@ class GenreViewSet(CategoryGenreBaseViewSet):
     """
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_scope = GENRES
 
 
 class CategoryViewSet(CategoryGenreBaseViewSet):
@@ -225,3 +313,4 @@ class CategoryViewSet(CategoryGenreBaseViewSet):
     """
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_scope = CATEGORIES
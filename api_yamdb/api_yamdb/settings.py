@@ -34,14 +34,19 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'api.middleware.QueryInstrumentationMiddleware',
+    'api.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'api.middleware.CsrfViewMiddleware',
+    'api.middleware.AuthenticationMiddleware',
+    'api.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# API аутентифицируется только по JWT: для этих путей middleware сессий,
+# CSRF, сообщений и аутентификации Django пропускаются.
+LEAN_MIDDLEWARE_PATHS = ('/api/',)
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
@@ -74,6 +79,33 @@ DATABASES = {
 }
 
 
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 60 * 5
+RESPONSE_CACHE_KEY_PREFIX = 'api'
+# Время жизни поколений областей кеша: ограничивает, как долго процесс
+# с локальным кешем не видит сброс из другого процесса (команды).
+# Для общего кеша (Redis, Memcached) можно задать None.
+RESPONSE_CACHE_GENERATION_TIMEOUT = 60
+PAGINATION_COUNT_TIMEOUT = 60 * 5
+
+# Наибольшее число произведений в одном запросе к titles/bulk/.
+TITLE_BULK_MAX_ITEMS = 1000
+
+AUTH_USER_CACHE_ALIAS = 'default'
+AUTH_USER_CACHE_TIMEOUT = 60
+AUTH_USER_CACHE_KEY_PREFIX = 'auth-user'
+# Число проверенных JWT-токенов в памяти каждого процесса, 0 - без кеша.
+AUTH_TOKEN_CACHE_SIZE = 1024
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -92,6 +124,37 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Logging
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api.queries': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'api.cache': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
+}
+
+# Количество запросов и время БД для каждого запроса к серверу
+# (заголовок Server-Timing и лог 'api.queries').
+QUERY_INSTRUMENTATION_ENABLED = True
+QUERY_SLOWEST_COUNT = 3
+# Шаблон SQL, повторенный столько раз за запрос, считается признаком N+1.
+QUERY_REPEAT_THRESHOLD = 5
+
+
 # Internationalization
 
 LANGUAGE_CODE = 'en-us'
@@ -117,25 +180,64 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedUserJWTAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.CachedCountPagination',
     'PAGE_SIZE': 5,
+    # Размер ведра token bucket и время его полного пополнения.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': '5/min',
+        'token': '10/min',
+        'review_write': '30/min',
+    },
+    # Число доверенных прокси перед сервером: адрес клиента для throttle
+    # берется из X-Forwarded-For только за ними, при 0 - REMOTE_ADDR.
+    'NUM_PROXIES': 0,
 }
 
+THROTTLE_CACHE_ALIAS = 'default'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=30),
+    # Новый refresh-токен при каждом обновлении, старый отзывается.
+    'ROTATE_REFRESH_TOKENS': True,
+    'BLACKLIST_AFTER_ROTATION': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Отозванные refresh-токены хранятся в кеше до истечения их срока.
+# Для нескольких процессов нужен общий кеш (например, Redis).
+TOKEN_DENYLIST_CACHE_ALIAS = 'default'
+TOKEN_DENYLIST_KEY_PREFIX = 'token-denylist'
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 ADMIN_EMAIL = 'admin@yamdb.fake'
 
+# Письма кладутся в таблицу OutboxEmail и отправляются командой send_emails.
+EMAIL_OUTBOX_ENABLED = True
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+# Задержка перед повторной попыткой в секундах, удваивается с каждой попыткой.
+EMAIL_OUTBOX_RETRY_DELAY = 60
+EMAIL_OUTBOX_POLL_INTERVAL = 5
+# На сколько секунд письмо забирается из очереди на время отправки.
+EMAIL_OUTBOX_LEASE = 300
+
 # Constants
 
 SLICE_STR_SYMBOLS = 15
@@ -143,11 +245,21 @@ SCORE_MIN = 1
 SCORE_MAX = 10
 USERNAME_LENGTH = 150
 EMAIL_LENGTH = 254
+EMAIL_SUBJECT_LENGTH = 255
 FIRST_NAME_LENGHT = 150
 LAST_NAME_LENGHT = 150
 CODE_LENGHT = 6
 CODE_DEFAULT = '-' * CODE_LENGHT
 CODE_SYMBOLS = '0123456789'
+# Код подтверждения вычисляется как HMAC и не хранится в БД.
+CONFIRMATION_CODE_STATELESS = True
+# Окно действия кода в секундах: код действует от одного до двух окон.
+CONFIRMATION_CODE_TIMEOUT = 60 * 60
+# Неверных попыток, после которых выданные коды сгорают, а проверка
+# кодов пользователя блокируется на 2 * CONFIRMATION_CODE_TIMEOUT.
+CONFIRMATION_CODE_MAX_ATTEMPTS = 5
+CONFIRMATION_CODE_CACHE_ALIAS = 'default'
+CONFIRMATION_CODE_KEY_PREFIX = 'confirmation-code'
 CLASSIFICATION_NAME_LENGHT = 256
 CLASSIFICATION_SLUG_LENGHT = 50
 TITLE_NAME_LENGHT = 256
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (Category, Comment, Genre, OutboxEmail, Review,
+                            Title, User)
 
 admin.site.register(Title)
 admin.site.register(Category)
@@ -9,6 +10,13 @@ admin.site.register(Review)
 admin.site.register(Comment)
 
 
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('to', 'subject', 'created', 'attempts', 'sent')
+    list_filter = ('sent',)
+    search_fields = ('to',)
+
+
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
     list_display = (
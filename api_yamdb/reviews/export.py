@@ -0,0 +1,149 @@
+import csv
+import json
+from datetime import datetime
+from itertools import islice
+
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+
+CHUNK_SIZE = 2000
+CSV = 'csv'
+JSONL = 'jsonl'
+FORMATS = (CSV, JSONL)
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def values_rows(queryset, fields, chunk_size):
+    return queryset.order_by('id').values_list(*fields).iterator(
+        chunk_size=chunk_size
+    )
+
+
+def title_rows(chunk_size):
+    """
+    prefetch_related не работает с iterator(), поэтому жанры
+    загружаются отдельным запросом на каждую пачку произведений.
+    """
+    titles = values_rows(
+        Title.objects.all(),
+        ('id', 'name', 'year', 'category_id', 'description', 'rating'),
+        chunk_size,
+    )
+    for chunk in chunks(titles, chunk_size):
+        genres = {row[0]: [] for row in chunk}
+        links = GenreTitle.objects.filter(
+            title_id__in=genres, genre__isnull=False,
+        ).order_by('id').values_list('title_id', 'genre__slug')
+        for title_id, slug in links:
+            genres[title_id].append(slug)
+        for row in chunk:
+            yield (*row, genres[row[0]])
+
+
+# Файлы и столбцы совпадают с форматом import_csv. Дополнительные
+# столбцы произведений (description, rating, genre) импорт не требует:
+# рейтинг пересчитывается по отзывам, жанры берутся из genre_title.
+TABLES = {
+    'category': (
+        ('id', 'name', 'slug'),
+        lambda size: values_rows(
+            Category.objects.all(), ('id', 'name', 'slug'), size
+        ),
+    ),
+    'genre': (
+        ('id', 'name', 'slug'),
+        lambda size: values_rows(
+            Genre.objects.all(), ('id', 'name', 'slug'), size
+        ),
+    ),
+    'titles': (
+        ('id', 'name', 'year', 'category', 'description', 'rating', 'genre'),
+        title_rows,
+    ),
+    'genre_title': (
+        ('id', 'title_id', 'genre_id'),
+        lambda size: values_rows(
+            GenreTitle.objects.filter(
+                title__isnull=False, genre__isnull=False
+            ),
+            ('id', 'title_id', 'genre_id'), size,
+        ),
+    ),
+    'users': (
+        ('id', 'username', 'email', 'role', 'bio', 'first_name',
+         'last_name'),
+        lambda size: values_rows(User.objects.all(), (
+            'id', 'username', 'email', 'role', 'bio', 'first_name',
+            'last_name',
+        ), size),
+    ),
+    'review': (
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        lambda size: values_rows(Review.objects.all(), (
+            'id', 'title_id', 'text', 'author_id', 'score', 'pub_date',
+        ), size),
+    ),
+    'comments': (
+        ('id', 'review_id', 'text', 'author', 'pub_date'),
+        lambda size: values_rows(Comment.objects.all(), (
+            'id', 'review_id', 'text', 'author_id', 'pub_date',
+        ), size),
+    ),
+}
+
+
+def format_datetime(value):
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+class Echo:
+    """Файл для csv.writer, который возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return format_datetime(value)
+    if isinstance(value, list):
+        return ','.join(value)
+    return value
+
+
+def json_value(value):
+    if isinstance(value, datetime):
+        return format_datetime(value)
+    return value
+
+
+def export_lines(table, file_format=CSV, chunk_size=CHUNK_SIZE):
+    """
+    Строки выгрузки таблицы в CSV (с заголовком) или JSON Lines.
+    Записи читаются из БД пачками по chunk_size, поэтому память
+    не зависит от размера таблицы.
+    """
+    header, rows = TABLES[table]
+    if file_format == JSONL:
+        for row in rows(chunk_size):
+            yield json.dumps(
+                dict(zip(header, map(json_value, row))), ensure_ascii=False
+            ) + '\n'
+        return
+    writer = csv.writer(Echo(), lineterminator='\n')
+    yield writer.writerow(header)
+    for row in rows(chunk_size):
+        yield writer.writerow([csv_value(value) for value in row])
@@ -2,41 +2,43 @@ from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
                             Title, User)
 
 
-def category_create(row):
-    Category.objects.create(
+def category_from_row(row):
+    return Category(
         id=row[0],
         name=row[1],
         slug=row[2],
     )
 
 
-def genre_create(row):
-    Genre.objects.create(
+def genre_from_row(row):
+    return Genre(
         id=row[0],
         name=row[1],
         slug=row[2],
     )
 
 
-def title_create(row):
-    Title.objects.create(
+def title_from_row(row):
+    return Title(
         id=row[0],
         name=row[1],
         year=row[2],
         category_id=row[3],
+        # Столбец description есть в файлах, выгруженных export_data.
+        description=(row[4] or None) if len(row) > 4 else None,
     )
 
 
-def genre_title_create(row):
-    GenreTitle.objects.create(
+def genre_title_from_row(row):
+    return GenreTitle(
         id=row[0],
         title_id=row[1],
         genre_id=row[2],
     )
 
 
-def user_create(row):
-    User.objects.create(
+def user_from_row(row):
+    return User(
         id=row[0],
         username=row[1],
         email=row[2],
@@ -47,8 +49,8 @@ def user_create(row):
     )
 
 
-def review_create(row):
-    Review.objects.create(
+def review_from_row(row):
+    return Review(
         id=row[0],
         title_id=row[1],
         text=row[2],
@@ -58,8 +60,8 @@ def review_create(row):
     )
 
 
-def comment_create(row):
-    Comment.objects.create(
+def comment_from_row(row):
+    return Comment(
         id=row[0],
         review_id=row[1],
         text=row[2],
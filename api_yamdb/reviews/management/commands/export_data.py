@@ -0,0 +1,56 @@
+import os
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from reviews.export import CHUNK_SIZE, CSV, FORMATS, TABLES, export_lines
+
+SUCCESS_EXPORT = (
+    'Выгрузка {filename} завершена! Строк: {rows}, {rate:.0f} строк/с.'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгрузка произведений, жанров, категорий, пользователей, отзывов '
+        'и комментариев в csv файлы формата import_csv или в JSON Lines.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default='.',
+            help='Директория для файлов выгрузки.',
+        )
+        parser.add_argument(
+            '--format', dest='file_format', choices=FORMATS, default=CSV,
+        )
+        parser.add_argument(
+            '--tables', nargs='+', choices=TABLES.keys(),
+            default=list(TABLES),
+            help='Выгружаемые таблицы.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help='Количество строк, читаемых из БД за один раз.',
+        )
+
+    def handle(self, *args, **options):
+        os.makedirs(options['path'], exist_ok=True)
+        for table in options['tables']:
+            filename = f'{table}.{options["file_format"]}'
+            started = perf_counter()
+            rows = -1 if options['file_format'] == CSV else 0
+            with open(
+                os.path.join(options['path'], filename), 'w',
+                encoding='utf-8', newline='',
+            ) as file:
+                for line in export_lines(
+                    table, options['file_format'], options['chunk_size']
+                ):
+                    file.write(line)
+                    rows += 1
+            elapsed = perf_counter() - started
+            self.stdout.write(self.style.SUCCESS(SUCCESS_EXPORT.format(
+                filename=filename, rows=rows,
+                rate=rows / elapsed if elapsed else rows,
+            )))
@@ -1,35 +1,258 @@
 import csv
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+from time import perf_counter
 
+import django
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
 from reviews.management.commands._orm_func_for_import import (
-    category_create, comment_create, genre_create, genre_title_create,
-    review_create, title_create, user_create)
+    category_from_row, comment_from_row, genre_from_row, genre_title_from_row,
+    review_from_row, title_from_row, user_from_row)
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+from reviews.ratings import rebuild_titles_rating
+from reviews.signals import bulk_changed
 
-SUCCESS_IMPORT = 'Импорт файла {} завершен успешно!'
+SUCCESS_IMPORT = (
+    'Импорт файла {filename} завершен успешно! '
+    'Строк: {rows}, {rate:.0f} строк/с.'
+)
+SUCCESS_RATING = 'Рейтинг произведений пересчитан.'
+ERROR_ROW = 'Файл {filename}, запись {number}: {errors}'
 CSV_PATH = os.path.join(settings.BASE_DIR, 'static/data/')
+BATCH_SIZE = 1000
 FILE_AND_MODEL = {
-    'category.csv': category_create,
-    'genre.csv': genre_create,
-    'titles.csv': title_create,
-    'genre_title.csv': genre_title_create,
-    'users.csv': user_create,
-    'review.csv': review_create,
-    'comments.csv': comment_create,
+    'category.csv': (Category, category_from_row),
+    'genre.csv': (Genre, genre_from_row),
+    'titles.csv': (Title, title_from_row),
+    'genre_title.csv': (GenreTitle, genre_title_from_row),
+    'users.csv': (User, user_from_row),
+    'review.csv': (Review, review_from_row),
+    'comments.csv': (Comment, comment_from_row),
 }
+# Файлы, которые должны быть вставлены раньше (граф зависимостей).
+DEPENDENCIES = {
+    'titles.csv': ('category.csv',),
+    'genre_title.csv': ('titles.csv', 'genre.csv'),
+    'review.csv': ('titles.csv', 'users.csv'),
+    'comments.csv': ('review.csv', 'users.csv'),
+}
+# Пароль не импортируется: пользователи входят по коду подтверждения.
+NOT_VALIDATED = ('password',)
+
+
+def get_import_order(files):
+    """
+    Порядок вставки файлов по графу DEPENDENCIES (алгоритм Кана),
+    при равных условиях - в порядке FILE_AND_MODEL. Зависимости,
+    которых нет среди импортируемых файлов, считаются уже загруженными.
+    """
+    files = [filename for filename in FILE_AND_MODEL if filename in files]
+    waiting = {
+        filename: {
+            dependency for dependency in DEPENDENCIES.get(filename, ())
+            if dependency in files
+        }
+        for filename in files
+    }
+    order = []
+    while waiting:
+        ready = [
+            filename for filename in files if waiting.get(filename) == set()
+        ]
+        if not ready:
+            raise ValueError(f'Циклические зависимости: {sorted(waiting)}')
+        for filename in ready:
+            order.append(filename)
+            del waiting[filename]
+            for dependencies in waiting.values():
+                dependencies.discard(filename)
+    return order
+
+
+def read_chunks(path, batch_size):
+    """Записи csv файла пачками: (номер первой записи, строки)."""
+    with open(path, 'r', encoding='utf-8', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader)
+        number = 1
+        while True:
+            rows = list(islice(reader, batch_size))
+            if not rows:
+                return
+            yield number, rows
+            number += len(rows)
+
+
+def convert_rows(filename, number, rows):
+    """
+    Создает объекты из строк файла и проверяет значения полей
+    (clean_fields приводит их к типам полей). Выполняется в рабочем
+    процессе, к БД не обращается: связи проверяются при вставке.
+    Возвращает объекты и список ошибок (номер записи, сообщения).
+    """
+    model, from_row = FILE_AND_MODEL[filename]
+    exclude = [
+        field.name for field in model._meta.fields
+        if field.is_relation or field.primary_key
+        or field.name in NOT_VALIDATED
+    ]
+    objects, errors = [], []
+    for offset, row in enumerate(rows):
+        try:
+            obj = from_row(row)
+            obj.clean_fields(exclude=exclude)
+        except ValidationError as error:
+            errors.append((number + offset, error.message_dict))
+        except IndexError:
+            errors.append((number + offset, {'row': row}))
+        else:
+            objects.append(obj)
+    return objects, errors
+
+
+def make_pool(workers, mp_context=None):
+    """
+    Пул процессов для convert_rows. При запуске процессов через spawn
+    (по умолчанию на macOS и Windows) Django в них не настроен,
+    поэтому каждый процесс вызывает django.setup(); настройки берутся
+    из унаследованного DJANGO_SETTINGS_MODULE.
+    """
+    return ProcessPoolExecutor(
+        workers, mp_context=mp_context, initializer=django.setup
+    )
+
+
+def run_tasks(pool, tasks, window):
+    """
+    Выполняет convert_rows для пачек в пуле процессов, держа в работе
+    не больше window пачек, и отдает результаты в порядке пачек.
+    Без пула пачки обрабатываются в текущем процессе.
+    """
+    if pool is None:
+        for filename, number, rows in tasks:
+            yield filename, convert_rows(filename, number, rows)
+        return
+    pending = deque()
+    for task in tasks:
+        pending.append((task[0], pool.submit(convert_rows, *task)))
+        if len(pending) >= window:
+            filename, future = pending.popleft()
+            yield filename, future.result()
+    while pending:
+        filename, future = pending.popleft()
+        yield filename, future.result()
+
+
+@contextmanager
+def dates_from_file(models):
+    """
+    auto_now_add заменяет дату публикации при вставке текущим временем,
+    на время импорта дата берется из файла.
+    """
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
 
 
 class Command(BaseCommand):
     help = 'Импорт данных из csv файлов в БД'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество строк в одном INSERT.',
+        )
+        parser.add_argument(
+            '--path', default=CSV_PATH,
+            help='Директория с csv файлами.',
+        )
+        parser.add_argument(
+            '--files', nargs='+', choices=FILE_AND_MODEL.keys(),
+            default=list(FILE_AND_MODEL),
+            help='Импортируемые файлы.',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Количество процессов для разбора и проверки строк, '
+                 '0 — разбирать в текущем процессе.',
+        )
+
     def handle(self, *args, **options):
-        for filename, model in FILE_AND_MODEL.items():
-            with open(CSV_PATH + filename, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                next(reader)
-                for row in reader:
-                    model(row)
-            self.stdout.write(
-                self.style.SUCCESS(SUCCESS_IMPORT.format(filename)))
+        """
+        Разбор и проверка пачек всех файлов идут параллельно в рабочих
+        процессах, а вставка — в текущем процессе в порядке графа
+        зависимостей, в одной транзакции.
+        """
+        order = get_import_order(options['files'])
+        tasks = (
+            (filename, number, rows)
+            for filename in order
+            for number, rows in read_chunks(
+                os.path.join(options['path'], filename),
+                options['batch_size'],
+            )
+        )
+        workers = options['workers']
+        pool = make_pool(workers) if workers > 0 else nullcontext()
+        models = [FILE_AND_MODEL[filename][0] for filename in order]
+        with pool, transaction.atomic(), dates_from_file(models):
+            results = run_tasks(
+                pool if workers > 0 else None, tasks, workers * 2
+            )
+            rows = dict.fromkeys(order, 0)
+            # Время файла - ожидание разбора его пачек и их вставка.
+            elapsed = dict.fromkeys(order, 0.0)
+            started = perf_counter()
+            for filename, (objects, errors) in results:
+                if errors:
+                    raise CommandError('\n'.join(
+                        ERROR_ROW.format(
+                            filename=filename, number=number, errors=error
+                        )
+                        for number, error in errors
+                    ))
+                self.insert(FILE_AND_MODEL[filename][0], objects)
+                rows[filename] += len(objects)
+                finished = perf_counter()
+                elapsed[filename] += finished - started
+                started = finished
+            for filename in order:
+                self.stdout.write(self.style.SUCCESS(SUCCESS_IMPORT.format(
+                    filename=filename, rows=rows[filename],
+                    rate=(
+                        rows[filename] / elapsed[filename]
+                        if elapsed[filename] else 0
+                    ),
+                )))
+            if 'review.csv' in order:
+                rebuild_titles_rating()
+                self.stdout.write(self.style.SUCCESS(SUCCESS_RATING))
+        bulk_changed.send(sender=self.__class__, models=models)
+
+    def insert(self, model, batch):
+        """
+        bulk_create не поддерживает модели с multi-table наследованием
+        (Category и Genre), их строки сохраняются по одной
+        в рамках общей транзакции.
+        """
+        if model._meta.parents:
+            for obj in batch:
+                obj.save(force_insert=True)
+            return
+        model.objects.bulk_create(batch, batch_size=len(batch))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title
+from reviews.ratings import rebuild_titles_rating
+from reviews.signals import bulk_changed
+
+SUCCESS_REBUILD = 'Рейтинг пересчитан для произведений: {}'
+
+
+class Command(BaseCommand):
+    help = 'Пересчет суммы оценок, количества отзывов и рейтинга произведений'
+
+    def handle(self, *args, **options):
+        count = rebuild_titles_rating()
+        bulk_changed.send(sender=self.__class__, models=(Title,))
+        self.stdout.write(self.style.SUCCESS(SUCCESS_REBUILD.format(count)))
@@ -0,0 +1,49 @@
+from time import sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from reviews.outbox import send_queued_mail
+
+SUCCESS_SEND = 'Отправлено писем: {sent}, с ошибкой: {failed}.'
+
+
+class Command(BaseCommand):
+    help = 'Отправка писем из очереди'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Количество писем, отправляемых через одно соединение.',
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, проверяя очередь с интервалом.',
+        )
+        parser.add_argument(
+            '--interval', type=float,
+            default=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = self.send_all(options['batch_size'])
+            if sent or failed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    SUCCESS_SEND.format(sent=sent, failed=failed)
+                ))
+            if not options['loop']:
+                return
+            sleep(options['interval'])
+
+    def send_all(self, batch_size):
+        """Отправляет пачки, пока в очереди есть готовые к отправке письма."""
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_queued_mail(batch_size)
+            total_sent += sent
+            total_failed += failed
+            if sent + failed < batch_size:
+                return total_sent, total_failed
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from reviews.search import CREATE_SEARCH_INDEX, DROP_SEARCH_INDEX
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_outbox_email'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_on_sqlite(CREATE_SEARCH_INDEX),
+            run_on_sqlite(DROP_SEARCH_INDEX),
+        ),
+    ]
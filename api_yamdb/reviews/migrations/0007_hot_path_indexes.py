@@ -0,0 +1,43 @@
+# Generated by Django 3.2 on 2026-10-18 02:53
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def delete_duplicate_genres(apps, schema_editor):
+    """Оставляет одну связь на пару (произведение, жанр)."""
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    keep = (
+        GenreTitle.objects.values('title', 'genre')
+        .annotate(keep_id=Min('id')).values('keep_id')
+    )
+    GenreTitle.objects.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', '-pub_date'], name='comment_review_pub_date'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', '-pub_date'], name='review_title_pub_date'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year'], name='title_year'),
+        ),
+        migrations.RunPython(
+            delete_duplicate_genres, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='genretitle',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_genre_title'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
+from django.utils import timezone
 
 from api_yamdb import settings
 from api_yamdb.settings import SLICE_STR_SYMBOLS, SCORE_MIN, SCORE_MAX
@@ -57,6 +58,17 @@ class User(AbstractUser):
         default=settings.CODE_DEFAULT
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженное из БД имя пользователя."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_username = instance.__dict__.get('username')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_username = self.username
+
     @property
     def is_user(self):
         """Обычный пользователь."""
@@ -138,11 +150,29 @@ class Title(models.Model):
         null=True,
         blank=True,
     )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0,
+        editable=False,
+    )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        null=True,
+        editable=False,
+    )
 
     class Meta:
         default_related_name = 'titles'
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = (
+            models.Index(fields=('year',), name='title_year'),
+        )
 
     def __str__(self) -> str:
         return self.name[:SLICE_STR_SYMBOLS]
@@ -163,6 +193,11 @@ class GenreTitle(models.Model):
 
     class Meta:
         default_related_name = 'genre_title'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'genre'),
+                name='unique_genre_title'),
+        )
 
     def __str__(self) -> str:
         return f'{self.genre}-{self.title}'
@@ -222,9 +257,28 @@ class Review(FeedbackModel):
         ],
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные из БД оценку и произведение."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        instance._loaded_title_id = instance.__dict__.get('title_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_score = self.score
+        self._loaded_title_id = self.title_id
+
     class Meta(FeedbackModel.Meta):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
+        indexes = (
+            models.Index(
+                fields=('title', '-pub_date'),
+                name='review_title_pub_date',
+            ),
+        )
         constraints = (
             models.UniqueConstraint(
                 fields=['author', 'title'],
@@ -243,3 +297,63 @@ class Comment(FeedbackModel):
     class Meta(FeedbackModel.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('review', '-pub_date'),
+                name='comment_review_pub_date',
+            ),
+        )
+
+
+class OutboxEmail(models.Model):
+    """Письмо в очереди на отправку."""
+    subject = models.CharField(
+        verbose_name='Тема',
+        max_length=settings.EMAIL_SUBJECT_LENGTH,
+    )
+    body = models.TextField(
+        verbose_name='Текст',
+    )
+    from_email = models.EmailField(
+        verbose_name='Отправитель',
+        max_length=settings.EMAIL_LENGTH,
+    )
+    to = models.EmailField(
+        verbose_name='Получатель',
+        max_length=settings.EMAIL_LENGTH,
+    )
+    created = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True,
+    )
+    send_after = models.DateTimeField(
+        verbose_name='Отправить не раньше',
+        default=timezone.now,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попыток отправки',
+        default=0,
+    )
+    sent = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+        blank=True,
+    )
+    error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True,
+    )
+
+    class Meta:
+        ordering = ('send_after',)
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Очередь писем'
+        indexes = (
+            models.Index(
+                fields=('sent', 'send_after'),
+                name='outbox_pending',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.to}: {self.subject[:SLICE_STR_SYMBOLS]}'
@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from reviews.models import OutboxEmail
+
+
+def queue_mail(subject, message, from_email, recipient):
+    """
+    Ставит письмо в очередь, не дожидаясь SMTP-сервера.
+    При выключенной очереди отправляет письмо сразу.
+    """
+    if not settings.EMAIL_OUTBOX_ENABLED:
+        send_mail(subject, message, from_email, [recipient])
+        return
+    OutboxEmail.objects.create(
+        subject=subject, body=message, from_email=from_email, to=recipient,
+    )
+
+
+def get_retry_delay(attempts):
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def claim_queued_mail(now, batch_size):
+    """
+    Забирает пачку готовых к отправке писем: переносит их send_after
+    на EMAIL_OUTBOX_LEASE секунд вперед и учитывает попытку. Короткая
+    транзакция не держит блокировку БД на время отправки. Условие
+    на прежний send_after не дает двум процессам забрать одно письмо,
+    даже если select_for_update не поддерживается (SQLite).
+    """
+    lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+    with transaction.atomic():
+        ids = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True).filter(
+                sent__isnull=True,
+                send_after__lte=now,
+                attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            ).values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        OutboxEmail.objects.filter(
+            id__in=ids, sent__isnull=True, send_after__lte=now,
+        ).update(send_after=lease_until, attempts=F('attempts') + 1)
+        return list(
+            OutboxEmail.objects.filter(id__in=ids, send_after=lease_until)
+        )
+
+
+def send_queued_mail(batch_size=None):
+    """
+    Отправляет пачку писем из очереди через одно соединение.
+    Во время отправки транзакция не открыта: письма забираются
+    и результаты записываются отдельными короткими транзакциями.
+    Если процесс упадет во время отправки, письма снова попадут
+    в очередь через EMAIL_OUTBOX_LEASE секунд.
+    Неудачные письма (ошибка любого типа) откладываются с экспоненциальной
+    задержкой, после EMAIL_OUTBOX_MAX_ATTEMPTS попыток больше
+    не отправляются.
+    Возвращает количество отправленных и неотправленных писем.
+    """
+    now = timezone.now()
+    emails = claim_queued_mail(
+        now, batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    )
+    if not emails:
+        return 0, 0
+    failed = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        connection = None
+        connection_error = error
+    for email in emails:
+        try:
+            if connection is None:
+                raise connection_error
+            connection.send_messages([EmailMessage(
+                email.subject, email.body, email.from_email, [email.to],
+                connection=connection,
+            )])
+        except Exception as error:
+            # Любая ошибка письма (BadHeaderError, ошибка кодировки)
+            # откладывает только его, остальные письма пачки уходят.
+            failed += 1
+            email.error = str(error) or error.__class__.__name__
+            email.send_after = now + get_retry_delay(email.attempts)
+        else:
+            email.sent = timezone.now()
+            email.error = ''
+    if connection is not None:
+        connection.close()
+    with transaction.atomic():
+        OutboxEmail.objects.bulk_update(
+            emails, ('sent', 'send_after', 'error')
+        )
+    return len(emails) - failed, failed
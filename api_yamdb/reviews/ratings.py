@@ -0,0 +1,46 @@
+from django.db.models import (Avg, Count, F, FloatField, IntegerField,
+                              OuterRef, Subquery, Sum)
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from reviews.models import Review, Title
+
+
+def change_title_rating(title_id, score_delta, count_delta):
+    """
+    Инкрементально обновляет сумму оценок, количество отзывов
+    и рейтинг произведения одним UPDATE-запросом.
+    Выражения в SET вычисляются по значениям строки до обновления.
+    """
+    Title.objects.filter(pk=title_id).update(
+        score_sum=F('score_sum') + score_delta,
+        review_count=F('review_count') + count_delta,
+        rating=(
+            Cast(F('score_sum') + score_delta, FloatField())
+            / NullIf(F('review_count') + count_delta, 0)
+        ),
+    )
+
+
+def rebuild_titles_rating(titles=None):
+    """Пересчитывает рейтинг произведений по их отзывам с нуля."""
+    if titles is None:
+        titles = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return titles.update(
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0,
+            output_field=IntegerField(),
+        ),
+        review_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0,
+            output_field=IntegerField(),
+        ),
+        rating=Subquery(
+            reviews.annotate(average=Avg('score')).values('average'),
+            output_field=FloatField(),
+        ),
+    )
@@ -0,0 +1,68 @@
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = 'reviews_title_search'
+TOKEN = re.compile(r'\w+')
+
+# Полнотекстовый индекс SQLite FTS5 по названию и описанию произведений.
+# Индекс хранит только токены (content='reviews_title'), синхронизацию
+# при любой записи в reviews_title, в том числе bulk_create и update(),
+# выполняют триггеры. Обновление рейтинга не меняет name и description
+# и индекс не затрагивает. Миграции, которые на SQLite пересоздают
+# таблицу reviews_title (AlterField, RemoveField), удаляют и триггеры:
+# после них нужно заново выполнить DROP_SEARCH_INDEX и CREATE_SEARCH_INDEX.
+CREATE_SEARCH_INDEX = (
+    f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+    f"name, description, content='reviews_title', content_rowid='id')",
+    f"CREATE TRIGGER {SEARCH_TABLE}_insert AFTER INSERT ON reviews_title "
+    f"BEGIN INSERT INTO {SEARCH_TABLE}(rowid, name, description) "
+    f"VALUES (new.id, new.name, new.description); END",
+    f"CREATE TRIGGER {SEARCH_TABLE}_delete AFTER DELETE ON reviews_title "
+    f"BEGIN INSERT INTO {SEARCH_TABLE}"
+    f"({SEARCH_TABLE}, rowid, name, description) "
+    f"VALUES ('delete', old.id, old.name, old.description); END",
+    f"CREATE TRIGGER {SEARCH_TABLE}_update "
+    f"AFTER UPDATE OF name, description ON reviews_title "
+    f"BEGIN INSERT INTO {SEARCH_TABLE}"
+    f"({SEARCH_TABLE}, rowid, name, description) "
+    f"VALUES ('delete', old.id, old.name, old.description); "
+    f"INSERT INTO {SEARCH_TABLE}(rowid, name, description) "
+    f"VALUES (new.id, new.name, new.description); END",
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')",
+)
+DROP_SEARCH_INDEX = (
+    f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_update',
+    f'DROP TABLE IF EXISTS {SEARCH_TABLE}',
+)
+
+
+def search_titles(queryset, value, columns):
+    """
+    Оставляет произведения, в колонках которых есть все слова запроса
+    (без учета регистра, слово запроса может быть началом слова).
+    На SQLite поиск идет по индексу FTS5, на других БД — через icontains.
+    """
+    tokens = TOKEN.findall(value.lower())
+    if not tokens:
+        return queryset.none()
+    if connections[queryset.db].vendor != 'sqlite':
+        return queryset.filter(reduce(and_, (
+            reduce(or_, (
+                Q(**{f'{column}__icontains': token}) for column in columns
+            ))
+            for token in tokens
+        )))
+    match = '{%s} : (%s)' % (
+        ' '.join(columns), ' '.join(f'"{token}"*' for token in tokens)
+    )
+    return queryset.filter(id__in=RawSQL(
+        f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s',
+        (match,),
+    ))
@@ -0,0 +1,43 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from reviews.models import Review, Title
+from reviews.ratings import change_title_rating, rebuild_titles_rating
+
+# Массовое изменение записей в обход save и delete (импорт, пересчет
+# рейтинга), сигналы моделей при этом не отправляются.
+# Аргумент models - измененные модели.
+bulk_changed = Signal()
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw, **kwargs):
+    """Обновляет рейтинг произведения при создании и изменении отзыва."""
+    if raw:
+        return
+    loaded_title_id = getattr(instance, '_loaded_title_id', None)
+    loaded_score = getattr(instance, '_loaded_score', None)
+    if created:
+        change_title_rating(instance.title_id, instance.score, 1)
+    elif loaded_title_id is None or loaded_score is None:
+        rebuild_titles_rating(Title.objects.filter(
+            pk__in=(loaded_title_id, instance.title_id)
+        ))
+    elif loaded_title_id != instance.title_id:
+        change_title_rating(loaded_title_id, -loaded_score, -1)
+        change_title_rating(instance.title_id, instance.score, 1)
+    elif loaded_score != instance.score:
+        change_title_rating(
+            instance.title_id, instance.score - loaded_score, 0
+        )
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Обновляет рейтинг произведения при удалении отзыва."""
+    title_id = getattr(instance, '_loaded_title_id', None)
+    score = getattr(instance, '_loaded_score', None)
+    if title_id is None or score is None:
+        rebuild_titles_rating(Title.objects.filter(pk=instance.title_id))
+        return
+    change_title_rating(title_id, -score, -1)
@@ -0,0 +1,10 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Кеш не сбрасывается вместе с тестовой БД, очищаем его сами."""
+    for cache in caches.all():
+        cache.clear()
+    yield
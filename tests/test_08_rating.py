@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, admin_client, admin,
+                                              user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения обновляется '
+            'при создании отзывов.'
+        )
+
+        response = user_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/',
+            data={'score': 9}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(admin_client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения обновляется '
+            'при изменении оценки в отзыве.'
+        )
+
+        response = admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) == 9, (
+            'Проверьте, что рейтинг произведения обновляется '
+            'при удалении отзыва.'
+        )
+
+        admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/'
+        )
+        assert self.get_rating(admin_client, title_id) is None, (
+            'Проверьте, что у произведения без отзывов рейтинг `None`.'
+        )
+
+    def test_02_rebuild_ratings_command(self, admin_client, admin,
+                                        user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        Review.objects.filter(author=user).update(score=1)
+        Title.objects.update(score_sum=0, review_count=0, rating=None)
+
+        call_command('rebuild_ratings')
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.review_count, title.rating) == (
+            6, 2, 3.0
+        ), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'рейтинг произведений по отзывам.'
+        )
+        assert self.get_rating(admin_client, titles[1]['id']) is None
@@ -0,0 +1,39 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+TITLES_URL = '/api/v1/titles/'
+# COUNT(*) для пагинации, страница произведений с категориями
+# и один запрос на жанры всех произведений страницы.
+TITLES_LIST_QUERIES = 3
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    def test_01_titles_list_query_count(self, admin_client, client,
+                                        django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        for title in titles:
+            response = admin_client.post(TITLES_URL, data={
+                **title, 'name': f'{title["name"]} 2'
+            })
+            assert response.status_code == HTTPStatus.CREATED
+        with django_assert_num_queries(TITLES_LIST_QUERIES):
+            response = client.get(TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == 4, (
+            f'Проверьте, что GET-запрос к `{TITLES_URL}` возвращает '
+            'все произведения.'
+        )
+
+    def test_02_title_detail_query_count(self, admin_client, client,
+                                         django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{TITLES_URL}{titles[0]["id"]}/'
+        with django_assert_num_queries(TITLES_LIST_QUERIES - 1):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['genre']) == 2
@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review, Title
+from tests.utils import create_titles
+
+PAGE_SIZE = 5
+
+
+def read_all_pages(client, url):
+    results = []
+    pages = 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` в режиме курсора '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в режиме курсора не выполняется подсчет '
+            'количества объектов.'
+        )
+        assert len(data['results']) <= PAGE_SIZE
+        results.extend(data['results'])
+        url = data['next']
+        pages += 1
+    return results, pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    def test_01_reviews_cursor(self, client, admin_client,
+                               django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        title = Title.objects.get(pk=titles[0]['id'])
+        for number in range(12):
+            author = django_user_model.objects.create_user(
+                username=f'reviewer{number}',
+                email=f'reviewer{number}@yamdb.fake',
+            )
+            Review.objects.create(
+                title=title, author=author, text=str(number),
+                score=number % 10 + 1,
+            )
+        expected = list(
+            title.reviews.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+
+        results, pages = read_all_pages(
+            client, f'/api/v1/titles/{title.id}/reviews/?pagination=cursor'
+        )
+        assert [review['id'] for review in results] == expected, (
+            'Проверьте, что в режиме курсора отзывы возвращаются '
+            'без пропусков и повторов в порядке убывания даты публикации.'
+        )
+        assert pages == 3
+
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.json()['count'] == len(expected), (
+            'Проверьте, что без параметров сохраняется постраничная '
+            'пагинация.'
+        )
+
+    def test_02_titles_cursor(self, client, admin_client, django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        for number in range(8):
+            response = admin_client.post('/api/v1/titles/', data={
+                **titles[number % 2], 'name': f'Фильм {number}'
+            })
+            assert response.status_code == HTTPStatus.CREATED
+        author = django_user_model.objects.create_user(
+            username='reviewer', email='reviewer@yamdb.fake',
+        )
+        for number, title in enumerate(Title.objects.all()[:4]):
+            Review.objects.create(
+                title=title, author=author, text='text', score=number % 2 + 5,
+            )
+
+        results, _ = read_all_pages(
+            client, '/api/v1/titles/?pagination=cursor'
+        )
+        response = client.get('/api/v1/titles/?page_size=100')
+        assert response.json()['count'] == len(results) == 10
+        ratings = [title['rating'] for title in results]
+        assert ratings == [6] * 2 + [5] * 2 + [None] * 6, (
+            'Проверьте, что в режиме курсора произведения сортируются '
+            'по убыванию рейтинга, а произведения без оценок идут последними.'
+        )
+        names = [title['name'] for title in results[4:]]
+        assert names == sorted(names)
+        assert len({title['id'] for title in results}) == 10
+
+    def test_03_invalid_cursor(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/?cursor=broken'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,30 @@
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, Genre, GenreTitle, Review, Title, User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ImportCSV:
+
+    def test_01_import_all_files(self):
+        call_command('import_csv', batch_size=10)
+        assert Title.objects.count() == 32
+        assert Genre.objects.count() == 15
+        assert GenreTitle.objects.count() == 42
+        assert User.objects.count() == 5
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        assert not Title.objects.exclude(
+            review_count=0
+        ).filter(rating__isnull=True).exists(), (
+            'Проверьте, что после импорта отзывов пересчитывается '
+            'рейтинг произведений.'
+        )
+
+    def test_02_import_selected_files(self):
+        call_command('import_csv', files=['genre.csv', 'category.csv'])
+        assert Genre.objects.count() == 15
+        assert not Title.objects.exists(), (
+            'Проверьте, что импортируются только указанные файлы.'
+        )
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from api.signals import LOCAL_CACHE_WARNING
+from tests.utils import create_genre, create_single_review, create_titles
+
+CACHE_HEADER = 'X-Cache'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ResponseCache:
+
+    def test_01_anonymous_list_is_cached(self, client, admin_client):
+        create_genre(admin_client)
+        response = client.get('/api/v1/genres/')
+        assert response[CACHE_HEADER] == 'MISS'
+        response = client.get('/api/v1/genres/')
+        assert response[CACHE_HEADER] == 'HIT', (
+            'Проверьте, что повторный GET-запрос анонима к `/api/v1/genres/` '
+            'обслуживается из кеша.'
+        )
+        assert response.json()['count'] == 3
+
+        response = admin_client.get('/api/v1/genres/')
+        assert CACHE_HEADER not in response, (
+            'Проверьте, что запросы авторизованных пользователей '
+            'не кешируются.'
+        )
+
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Вестерн', 'slug': 'western'}
+        )
+        response = client.get('/api/v1/genres/')
+        assert response[CACHE_HEADER] == 'MISS', (
+            'Проверьте, что создание жанра сбрасывает кеш списка жанров.'
+        )
+        assert response.json()['count'] == 4
+
+    def test_02_review_invalidates_reviews_and_titles(self, client,
+                                                      admin_client,
+                                                      user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        for url in (reviews_url, '/api/v1/titles/'):
+            client.get(url)
+            assert client.get(url)[CACHE_HEADER] == 'HIT'
+
+        create_single_review(user_client, title_id, 'text', 8)
+
+        response = client.get(reviews_url)
+        assert response[CACHE_HEADER] == 'MISS'
+        assert response.json()['count'] == 1
+        response = client.get('/api/v1/titles/')
+        assert response[CACHE_HEADER] == 'MISS', (
+            'Проверьте, что новый отзыв сбрасывает кеш списка произведений, '
+            'так как меняется рейтинг.'
+        )
+        ratings = {
+            title['id']: title['rating']
+            for title in response.json()['results']
+        }
+        assert ratings[title_id] == 8
+
+        other_url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        client.get(other_url)
+        create_single_review(user_client, titles[1]['id'], 'text', 3)
+        assert client.get(other_url)[CACHE_HEADER] == 'MISS'
+        assert client.get(reviews_url)[CACHE_HEADER] == 'HIT', (
+            'Проверьте, что отзыв к одному произведению не сбрасывает кеш '
+            'отзывов к другим произведениям.'
+        )
+
+    def test_03_cache_stats(self, client, admin_client, user_client):
+        client.get('/api/v1/categories/')
+        client.get('/api/v1/categories/')
+        response = user_client.get('/api/v1/stats/cache/')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.get('/api/v1/stats/cache/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'hits': 1, 'misses': 1}
+
+    def test_04_commands_invalidate_cache(self, client, caplog):
+        client.get('/api/v1/genres/')
+        call_command('import_csv', files=['genre.csv'])
+        response = client.get('/api/v1/genres/')
+        assert response[CACHE_HEADER] == 'MISS', (
+            'Проверьте, что команда `import_csv` сбрасывает кеш ответов.'
+        )
+        assert response.json()['count'] == 15
+        assert LOCAL_CACHE_WARNING in caplog.messages, (
+            'Проверьте, что команда предупреждает, что сброс локального '
+            'кеша не дойдет до процессов сервера.'
+        )
+
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/titles/')
+        call_command('rebuild_ratings')
+        assert client.get('/api/v1/titles/')[CACHE_HEADER] == 'MISS', (
+            'Проверьте, что команда `rebuild_ratings` сбрасывает кеш '
+            'списка произведений.'
+        )
+        assert client.get('/api/v1/genres/')[CACHE_HEADER] == 'HIT'
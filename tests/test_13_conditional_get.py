@@ -0,0 +1,134 @@
+from http import HTTPStatus
+from time import sleep, time
+
+import pytest
+
+from api import cache
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.fixture
+def next_second(monkeypatch):
+    """
+    Переводит часы кеша на секунду вперед: Last-Modified отдается,
+    только когда секунда последнего изменения прошла.
+    """
+    offset = [0]
+    monkeypatch.setattr(cache, 'time', lambda: time() + offset[0])
+
+    def advance():
+        offset[0] += 1
+    return advance
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGet:
+
+    def test_01_if_none_match(self, client, admin_client, user_client,
+                              next_second):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        client.get(url)
+        next_second()
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит ETag.'
+        )
+        assert response.get('Last-Modified')
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert response['ETag'] == etag
+        assert not response.content
+
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления отзыва ETag списка '
+            'отзывов меняется.'
+        )
+        assert response['ETag'] != etag
+        assert response.json()['count'] == 1
+
+    def test_02_if_modified_since(self, client, admin_client, next_second):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        client.get(url)
+        next_second()
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-Modified-Since` возвращает ответ со статусом 304.'
+        )
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == titles[0]['name']
+
+    def test_03_missing_resource_is_not_modified(self, client, admin_client,
+                                                 next_second):
+        titles, _, _ = create_titles(admin_client)
+        client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        next_second()
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        last_modified = response['Last-Modified']
+        for url in (
+            '/api/v1/titles/9999/',
+            '/api/v1/titles/9999/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/9999/',
+            '/api/v1/titles/9999/reviews/1/comments/',
+        ):
+            response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к несуществующему ресурсу `{url}` '
+                'с `If-Modified-Since` возвращает ответ со статусом 404.'
+            )
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            HTTP_IF_MODIFIED_SINCE=last_modified,
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_04_same_second_change(self, client, admin_client, next_second):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert 'Last-Modified' not in response, (
+            'Проверьте, что `Last-Modified` не отдается, пока идет секунда '
+            'последнего изменения: изменение в ту же секунду его не меняет.'
+        )
+        next_second()
+        response = client.get(url)
+        assert response.get('Last-Modified')
+
+    def test_05_generation_expires(self, client, admin_client, settings):
+        settings.RESPONSE_CACHE_GENERATION_TIMEOUT = 1
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = client.get(url)['ETag']
+        # Изменение из другого процесса не сбрасывает локальный кеш.
+        Title.objects.filter(pk=titles[0]['id']).update(name='new')
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == (
+            HTTPStatus.NOT_MODIFIED
+        )
+        sleep(1.1)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что поколения областей кеша живут не дольше '
+            '`RESPONSE_CACHE_GENERATION_TIMEOUT` секунд.'
+        )
+        assert response.json()['name'] == 'new'
@@ -0,0 +1,141 @@
+from datetime import timedelta
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from reviews.models import OutboxEmail
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException('SMTP недоступен')
+
+
+class RecordingBackend(BaseEmailBackend):
+    calls = []
+
+    def send_messages(self, email_messages):
+        self.calls.append((
+            connection.in_atomic_block,
+            list(OutboxEmail.objects.values_list('send_after', flat=True)),
+        ))
+        return len(email_messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14EmailOutbox:
+
+    url_signup = '/api/v1/auth/signup/'
+
+    def signup(self, client, number):
+        client.post(self.url_signup, data={
+            'email': f'user{number}@yamdb.fake',
+            'username': f'user{number}',
+        })
+
+    def test_01_signup_queues_email(self, client):
+        outbox_before_count = len(mail.outbox)
+        for number in range(3):
+            self.signup(client, number)
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{self.url_signup}` не отправляет '
+            'письмо сразу, а ставит его в очередь.'
+        )
+        assert OutboxEmail.objects.filter(sent__isnull=True).count() == 3
+
+        call_command('send_emails', batch_size=2)
+        assert len(mail.outbox) == outbox_before_count + 3, (
+            'Проверьте, что команда `send_emails` отправляет все письма '
+            'из очереди.'
+        )
+        assert not OutboxEmail.objects.filter(sent__isnull=True).exists()
+
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count + 3, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_02_failed_email_is_retried(self, client, settings):
+        settings.EMAIL_BACKEND = 'tests.test_14_email_outbox.FailingBackend'
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        self.signup(client, 1)
+
+        call_command('send_emails')
+        email = OutboxEmail.objects.get()
+        assert email.sent is None
+        assert email.attempts == 1
+        assert email.send_after > timezone.now(), (
+            'Проверьте, что неотправленное письмо откладывается '
+            'на время задержки.'
+        )
+        assert email.error
+
+        OutboxEmail.objects.update(send_after=timezone.now())
+        call_command('send_emails')
+        OutboxEmail.objects.update(send_after=timezone.now())
+        call_command('send_emails')
+        assert OutboxEmail.objects.get().attempts == 2, (
+            'Проверьте, что письмо не отправляется больше '
+            '`EMAIL_OUTBOX_MAX_ATTEMPTS` раз.'
+        )
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 3
+        call_command('send_emails')
+        assert OutboxEmail.objects.get().sent is not None
+
+    def test_03_poison_email_does_not_block_queue(self, client, settings):
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        self.signup(client, 1)
+        OutboxEmail.objects.create(
+            subject='Заголовок\nс переводом строки', body='text',
+            from_email='admin@yamdb.fake', to='user2@yamdb.fake',
+        )
+        outbox_before_count = len(mail.outbox)
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что ошибка одного письма не мешает отправке '
+            'остальных писем пачки.'
+        )
+        poison = OutboxEmail.objects.get(to='user2@yamdb.fake')
+        assert poison.sent is None and poison.attempts == 1, (
+            'Проверьте, что для письма с ошибкой учитывается попытка.'
+        )
+        assert poison.error
+
+    def test_04_no_transaction_while_sending(self, client, settings):
+        settings.EMAIL_BACKEND = 'tests.test_14_email_outbox.RecordingBackend'
+        RecordingBackend.calls.clear()
+        self.signup(client, 1)
+        call_command('send_emails')
+        assert len(RecordingBackend.calls) == 1
+        in_atomic_block, send_after = RecordingBackend.calls[0]
+        assert not in_atomic_block, (
+            'Проверьте, что письма отправляются без открытой транзакции.'
+        )
+        assert send_after[0] > timezone.now(), (
+            'Проверьте, что на время отправки письмо забирается '
+            'из очереди.'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.sent is not None and email.attempts == 1
+
+        OutboxEmail.objects.create(
+            subject='subject', body='text', from_email='admin@yamdb.fake',
+            to='user2@yamdb.fake',
+            send_after=timezone.now() + timedelta(minutes=5),
+        )
+        call_command('send_emails')
+        assert len(RecordingBackend.calls) == 1, (
+            'Проверьте, что письмо, забранное другим процессом, '
+            'не отправляется повторно.'
+        )
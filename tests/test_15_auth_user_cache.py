@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.authentication import get_user_cache, get_user_cache_key
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15AuthUserCache:
+
+    url = '/api/v1/categories/'
+
+    def test_01_user_lookup_is_cached(self, user_client):
+        user_client.get(self.url)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(self.url)
+        assert response.status_code == HTTPStatus.OK
+        assert not any(
+            'reviews_user' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что повторный запрос с тем же токеном не загружает '
+            'пользователя из БД.'
+        )
+
+    def test_02_role_change_invalidates_cache(self, admin_client,
+                                              user_client, user):
+        data = {'name': 'Сериалы', 'slug': 'series'}
+        response = user_client.post(self.url, data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = user_client.post(self.url, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что изменение роли пользователя сразу '
+            'учитывается при проверке прав.'
+        )
+
+    def test_03_me_returns_full_profile(self, user_client, user):
+        user_client.get(self.url)
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email
+        response = user_client.patch(
+            '/api/v1/users/me/', data={'first_name': 'Имя'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert (user.first_name, user.bio) == ('Имя', 'user bio'), (
+            'Проверьте, что `users/me/` изменяет только переданные поля.'
+        )
+
+    def test_04_inactive_user_rejected(self, user_client, user):
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        )
+        cache = get_user_cache()
+        key = get_user_cache_key(user.pk)
+        cache.set(key, {**cache.get(key), 'is_active': False})
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что слепок неактивного пользователя из кеша '
+            'не проходит аутентификацию.'
+        )
+
+        cache.delete(key)
+        user.is_active = False
+        user.save()
+        user_client.get('/api/v1/users/me/')
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что деактивированный пользователь не проходит '
+            'аутентификацию.'
+        )
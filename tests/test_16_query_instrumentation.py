@@ -0,0 +1,51 @@
+import json
+import logging
+
+import pytest
+
+from api.middleware import QueryRecorder
+from tests.utils import create_titles
+
+
+def execute(sql, params, many, context):
+    return None
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16QueryInstrumentation:
+
+    def test_01_server_timing_header(self, client, admin_client, caplog):
+        create_titles(admin_client)
+        logger = logging.getLogger('api.queries')
+        logger.addHandler(caplog.handler)
+        try:
+            response = client.get('/api/v1/titles/')
+        finally:
+            logger.removeHandler(caplog.handler)
+        assert response['Server-Timing'].startswith('db;dur='), (
+            'Проверьте, что ответ содержит заголовок `Server-Timing` '
+            'со временем запросов к БД.'
+        )
+        assert '"3 queries"' in response['Server-Timing']
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['path'] == '/api/v1/titles/'
+        assert record['queries'] == 3
+        assert len(record['slowest']) == 3
+        assert record['repeated'] == []
+
+    def test_02_repeated_shapes(self, settings):
+        recorder = QueryRecorder()
+        for number in range(4):
+            recorder(execute, 'SELECT * FROM t WHERE id = %s', (number,),
+                     False, {})
+        recorder(execute, 'SELECT * FROM t WHERE id IN (%s, %s)', (1, 2),
+                 False, {})
+        recorder(execute, 'SELECT * FROM t WHERE id IN (%s)', (1,),
+                 False, {})
+        assert recorder.count == 6
+        assert recorder.get_repeated(3) == [
+            {'sql': 'SELECT * FROM t WHERE id = %s', 'count': 4},
+        ]
+        assert recorder.get_repeated(2)[1] == {
+            'sql': 'SELECT * FROM t WHERE id IN (...)', 'count': 2,
+        }
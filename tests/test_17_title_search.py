@@ -0,0 +1,54 @@
+import pytest
+
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+def get_names(client, query):
+    response = client.get(f'/api/v1/titles/?{query}')
+    return sorted(title['name'] for title in response.json()['results'])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleSearch:
+
+    def test_01_name_search(self, client, admin_client):
+        create_titles(admin_client)
+        assert get_names(client, 'name=КРЕП') == ['Крепкий орешек'], (
+            'Проверьте, что поиск по названию не зависит от регистра '
+            'и находит слова по началу.'
+        )
+        assert get_names(client, 'name=орешек крепкий') == [
+            'Крепкий орешек'
+        ], 'Проверьте, что порядок слов в запросе не важен.'
+        assert get_names(client, 'name=крепкий терминатор') == []
+        assert get_names(client, 'name=!!!') == []
+
+    def test_02_search_in_description(self, client, admin_client):
+        create_titles(admin_client)
+        assert get_names(client, 'search=yippie') == ['Крепкий орешек'], (
+            'Проверьте, что параметр `search` ищет и по описанию.'
+        )
+        assert get_names(client, 'name=yippie') == []
+
+    def test_03_index_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+        assert get_names(client, 'name=терминатор') == []
+        assert get_names(client, 'name=чужой') == ['Чужой'], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        Title.objects.filter(pk=titles[1]['id']).delete()
+        assert get_names(client, 'search=yippie') == []
+
+    def test_04_exact_slug_filters(self, client, admin_client):
+        create_titles(admin_client)
+        assert get_names(client, 'genre=dram') == [], (
+            'Проверьте, что фильтр по жанру сравнивает slug целиком.'
+        )
+        assert get_names(client, 'genre=drama') == ['Крепкий орешек']
+        assert get_names(client, 'category=film') == []
+        assert get_names(client, 'category=films') == ['Терминатор']
@@ -0,0 +1,37 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError
+
+from reviews.models import Genre, GenreTitle, Title
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Indexes:
+
+    def test_01_unique_genre_title(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        title = Title.objects.get(pk=titles[0]['id'])
+        genre = Genre.objects.get(slug=genres[0]['slug'])
+        with pytest.raises(IntegrityError):
+            GenreTitle.objects.create(title=title, genre=genre)
+
+    def test_02_explain_uses_indexes(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(user_client, title_id, 'text', 5)
+        create_single_comment(
+            user_client, title_id, review.json()['id'], 'text'
+        )
+        output = StringIO()
+        call_command('explain_queries', stdout=output)
+        plan = output.getvalue()
+        for index in (
+            'title_year', 'review_title_pub_date', 'comment_review_pub_date',
+        ):
+            assert index in plan, (
+                f'Проверьте, что запросы вьюсетов используют индекс `{index}`.'
+            )
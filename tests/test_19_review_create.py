@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ReviewCreate:
+
+    def test_01_title_loaded_once(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        user_client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'text', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+        assert len(selects) == 1 and 'reviews_title' in selects[0], (
+            'Проверьте, что при создании отзыва произведение загружается '
+            'один раз, а повторный отзыв не ищется отдельным запросом.'
+        )
+
+    def test_02_repeat_review_rejected(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = {'text': 'text', 'score': 7}
+        assert user_client.post(url, data=data).status_code == (
+            HTTPStatus.CREATED
+        )
+        response = user_client.post(url, data={'text': 'again', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'non_field_errors' in response.json(), (
+            'Проверьте, что повторный отзыв возвращает ошибку валидации '
+            'в прежнем формате.'
+        )
+        assert Review.objects.count() == 1
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json()['rating'] == 7, (
+            'Проверьте, что отклоненный отзыв не меняет рейтинг.'
+        )
+
+    def test_03_missing_title(self, user_client):
+        response = user_client.post(
+            '/api/v1/titles/999/reviews/', data={'text': 'text', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
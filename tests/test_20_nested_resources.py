@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20NestedResources:
+
+    def create_comment(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id, other_title_id = titles[0]['id'], titles[1]['id']
+        review_id = create_single_review(
+            user_client, title_id, 'text', 5
+        ).json()['id']
+        comment_id = create_single_comment(
+            user_client, title_id, review_id, 'text'
+        ).json()['id']
+        return title_id, other_title_id, review_id, comment_id
+
+    def test_01_wrong_title_in_path(self, admin_client, user_client):
+        title_id, other_title_id, review_id, comment_id = (
+            self.create_comment(admin_client, user_client)
+        )
+        wrong_url = f'/api/v1/titles/{other_title_id}/reviews/{review_id}/'
+        for url in (
+            wrong_url,
+            f'{wrong_url}comments/',
+            f'{wrong_url}comments/{comment_id}/',
+        ):
+            response = user_client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` с отзывом другого '
+                'произведения возвращает ответ со статусом 404.'
+            )
+        response = user_client.post(
+            f'{wrong_url}comments/', data={'text': 'text'}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        response = user_client.get(
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 1
+
+    def test_02_list_without_parent_query(self, admin_client, user_client):
+        title_id, _, review_id, _ = self.create_comment(
+            admin_client, user_client
+        )
+        for url, table in (
+            (f'/api/v1/titles/{title_id}/reviews/', 'reviews_review'),
+            (
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+                'reviews_comment',
+            ),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = user_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert all(
+                f'FROM "{table}"' in query['sql']
+                for query in context.captured_queries
+            ), (
+                f'Проверьте, что GET-запрос к `{url}` выбирает только '
+                'объекты страницы, без загрузки родителя.'
+            )
+
+    def test_03_empty_page(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        response = user_client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == []
+        for url in (
+            '/api/v1/titles/999/reviews/',
+            '/api/v1/titles/999/reviews/?pagination=cursor',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/999/comments/',
+        ):
+            response = user_client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` с несуществующим '
+                'родителем возвращает ответ со статусом 404.'
+            )
@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response.json(), [
+        query['sql'] for query in context.captured_queries
+        if 'COUNT(*)' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21PaginationCount:
+
+    def test_01_count_is_cached(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        data, counts = count_queries(admin_client, url)
+        assert data['count'] == 2 and counts
+        data, counts = count_queries(admin_client, url)
+        assert data['count'] == 2
+        assert not counts, (
+            'Проверьте, что повторный запрос к списку берет количество '
+            'объектов из кеша.'
+        )
+        data, counts = count_queries(admin_client, f'{url}?year=1984')
+        assert data['count'] == 1 and counts, (
+            'Проверьте, что количество кешируется отдельно для фильтров.'
+        )
+        admin_client.post(url, data={**titles[0], 'name': 'Терминатор 2'})
+        data, _ = count_queries(admin_client, url)
+        assert data['count'] == 3, (
+            'Проверьте, что создание объекта сбрасывает кеш количества.'
+        )
+
+    def test_02_users_count_invalidated(self, admin_client):
+        data, _ = count_queries(admin_client, '/api/v1/users/')
+        users = data['count']
+        admin_client.post('/api/v1/users/', data={
+            'username': 'newuser', 'email': 'newuser@yamdb.fake'
+        })
+        data, _ = count_queries(admin_client, '/api/v1/users/')
+        assert data['count'] == users + 1
+
+    def test_03_skip_count(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        for number in range(4):
+            admin_client.post(
+                '/api/v1/titles/', data={**titles[0], 'name': f'{number}'}
+            )
+        url = '/api/v1/titles/?count=false'
+        data, counts = count_queries(admin_client, url)
+        assert not counts and data['count'] is None, (
+            'Проверьте, что с параметром `count=false` количество '
+            'объектов не считается.'
+        )
+        assert list(data) == ['count', 'next', 'previous', 'results']
+        assert len(data['results']) == 5 and data['next'], (
+            'Проверьте, что без подсчета количества ссылка на следующую '
+            'страницу определяется по самой странице.'
+        )
+        data, _ = count_queries(admin_client, data['next'])
+        assert len(data['results']) == 1
+        assert data['next'] is None and data['previous']
+        response = admin_client.get(f'{url}&page=3')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_last_page_without_count(self, admin_client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get(
+                '/api/v1/titles/?count=false&page=last'
+            )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что page=last с count=false отклоняется, '
+            'так как требует подсчета количества.'
+        )
+        assert not any(
+            'COUNT(*)' in query['sql'] for query in context.captured_queries
+        )
+        response = admin_client.get('/api/v1/titles/?page=last')
+        assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api import parsers, renderers
+from api.renderers import FastJSONRenderer
+from tests.utils import create_titles
+
+DATA = {
+    'text': 'Отзыв\u2028с разделителем',
+    'score': Decimal('7.50'),
+    'pub_date': datetime(2021, 5, 1, 12, tzinfo=timezone.utc),
+    'values': [1, 2.5, None, True],
+    1: 'ключ-число',
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22JSONRenderer:
+
+    def test_01_same_output(self, monkeypatch):
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA), (
+            'Проверьте, что FastJSONRenderer выдает те же байты, '
+            'что и JSONRenderer.'
+        )
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+    def test_02_api_json(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        response = admin_client.post(
+            '/api/v1/titles/', data={**titles[0], 'name': 'Чужой'},
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что JSON в теле запроса разбирается FastJSONParser.'
+        )
+        assert response['Content-Type'] == 'application/json'
+        assert response.json()['name'] == 'Чужой'
+        assert [genre['slug'] for genre in response.json()['genre']] == (
+            titles[0]['genre']
+        )
+
+    def test_03_parser_errors(self, admin_client, monkeypatch):
+        for orjson in (parsers.orjson, None):
+            monkeypatch.setattr(parsers, 'orjson', orjson)
+            response = admin_client.post(
+                '/api/v1/genres/', data='{"name": ',
+                content_type='application/json',
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert response.json()['detail'].startswith('JSON parse error')
@@ -0,0 +1,57 @@
+import pytest
+
+from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+from reviews.models import Title
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+def get_all_pages(client, url):
+    pages = []
+    while url:
+        data = client.get(url).json()
+        pages.append(data)
+        url = data['next']
+    return pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ValuesSerializers:
+
+    def test_01_same_json(self, admin_client, user_client, moderator_client,
+                          monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        Title.objects.create(name='Без категории', year=2000)
+        for number in range(6):
+            admin_client.post(
+                '/api/v1/titles/', data={**titles[1], 'name': str(number)}
+            )
+        review_id = create_single_review(
+            user_client, title_id, 'text', 7
+        ).json()['id']
+        create_single_review(moderator_client, title_id, 'text', 8)
+        create_single_comment(user_client, title_id, review_id, 'text')
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        urls = (
+            '/api/v1/titles/',
+            '/api/v1/titles/?pagination=cursor',
+            '/api/v1/titles/?ordering=category&pagination=cursor',
+            '/api/v1/titles/?genre=drama',
+            reviews_url,
+            f'{reviews_url}?pagination=cursor',
+            f'{reviews_url}{review_id}/comments/',
+        )
+        fast = [get_all_pages(admin_client, url) for url in urls]
+        for viewset in (TitleViewSet, ReviewViewSet, CommentViewSet):
+            monkeypatch.setattr(viewset, 'values_serializer_class', None)
+        for url, fast_pages in zip(urls, fast):
+            assert fast_pages == get_all_pages(admin_client, url), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` через values() '
+                'совпадает с ответом обычного сериализатора.'
+            )
+        assert any(
+            title['category'] is None and title['genre'] == []
+            for page in fast[0] for title in page['results']
+        )
+        assert fast[0][0]['results'][0]['rating'] == 7
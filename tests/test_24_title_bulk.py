@@ -0,0 +1,150 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import NotSupportedError, connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import GenreTitle, Title
+from tests.utils import create_titles
+
+URL = '/api/v1/titles/bulk/'
+
+
+def make_items(count, genres, category):
+    return [
+        {
+            'name': f'Сезон {number}',
+            'year': 2000 + number,
+            'genre': genres,
+            'category': category,
+            'description': 'Новинка',
+        }
+        for number in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24TitleBulk:
+
+    def test_01_bulk_create(self, admin_client):
+        create_titles(admin_client)
+        queries = []
+        for count in (2, 10):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(
+                    URL, data=make_items(count, ['horror', 'comedy'], 'films'),
+                    format='json',
+                )
+            queries.append(len(context.captured_queries))
+            assert response.status_code == HTTPStatus.CREATED
+            data = response.json()
+            assert len(data) == count
+            assert [genre['slug'] for genre in data[0]['genre']] == [
+                'horror', 'comedy'
+            ]
+            assert data[0]['category'] == {'name': 'Фильм', 'slug': 'films'}
+        assert queries[0] == queries[1], (
+            'Проверьте, что количество SQL-запросов к `titles/bulk/` '
+            'не зависит от количества произведений.'
+        )
+        assert Title.objects.count() == 14
+        assert GenreTitle.objects.filter(
+            title__name__startswith='Сезон'
+        ).count() == 24
+        response = admin_client.get('/api/v1/titles/?name=сезон')
+        assert response.json()['count'] == 12
+
+    def test_02_errors_per_item(self, admin_client):
+        create_titles(admin_client)
+        items = make_items(3, ['horror'], 'films')
+        items[1]['genre'] = ['unknown']
+        items[2]['year'] = 3000
+        response = admin_client.post(URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == 3 and errors[0] == {}, (
+            'Проверьте, что ошибки возвращаются по каждому элементу.'
+        )
+        assert 'genre' in errors[1] and 'year' in errors[2]
+        assert Title.objects.count() == 2, (
+            'Проверьте, что при ошибке ничего не сохраняется.'
+        )
+        response = admin_client.post(URL, data={'name': 'x'}, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_repeated_ids_and_genres(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        items = [
+            {'id': titles[0]['id'], 'genre': ['horror']},
+            {'id': titles[0]['id'], 'genre': ['comedy']},
+            {**make_items(1, ['horror', 'horror'], 'films')[0]},
+        ]
+        response = admin_client.post(URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторы id в запросе и жанров в элементе '
+            'возвращают ответ со статусом 400.'
+        )
+        errors = response.json()
+        assert errors[0] == {} and 'id' in errors[1] and 'genre' in errors[2]
+        assert Title.objects.count() == 2
+
+    def test_04_bulk_update(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        items = [
+            {'id': titles[0]['id'], 'name': 'Терминатор 2',
+             'genre': ['drama']},
+            {'id': titles[1]['id'], 'year': 1990},
+        ]
+        response = admin_client.post(URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.OK
+        first, second = response.json()
+        assert first['name'] == 'Терминатор 2'
+        assert [genre['slug'] for genre in first['genre']] == ['drama']
+        assert second['year'] == 1990 and second['name'] == titles[1]['name']
+        assert [genre['slug'] for genre in second['genre']] == ['drama']
+        response = admin_client.get('/api/v1/titles/?name=терминатор')
+        assert response.json()['results'][0]['name'] == 'Терминатор 2'
+
+        response = admin_client.post(
+            URL, data=[{'id': 999, 'name': 'Нет'}], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'id' in response.json()[0]
+
+    def test_05_permissions(self, user_client, client):
+        for request_client in (user_client, client):
+            response = request_client.post(
+                URL, data='[]', content_type='application/json'
+            )
+            assert response.status_code in (
+                HTTPStatus.FORBIDDEN, HTTPStatus.UNAUTHORIZED
+            )
+
+    def test_06_inserted_ids(self, admin_client, monkeypatch):
+        create_titles(admin_client)
+        monkeypatch.setattr(
+            connection.ops, 'bulk_batch_size', lambda fields, objs: 3
+        )
+        response = admin_client.post(
+            URL, data=make_items(8, ['horror'], 'films'), format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        names = dict(Title.objects.values_list('id', 'name'))
+        assert all(
+            names[title['id']] == title['name'] for title in response.json()
+        ), (
+            'Проверьте, что произведения, созданные несколькими пачками, '
+            'возвращаются со своими id.'
+        )
+
+    def test_07_unsupported_database(self, admin_client, monkeypatch):
+        create_titles(admin_client)
+        monkeypatch.setattr(connection, 'vendor', 'mysql')
+        with pytest.raises(NotSupportedError):
+            admin_client.post(
+                URL, data=make_items(2, ['horror'], 'films'), format='json'
+            )
+        assert Title.objects.count() == 2, (
+            'Проверьте, что для БД, не возвращающих id вставленных строк, '
+            'создание произведений списком завершается ошибкой.'
+        )
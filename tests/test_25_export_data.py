@@ -0,0 +1,83 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import (Category, ClassificationModel, Comment, Genre,
+                            GenreTitle, Review, Title, User)
+
+MODELS = (Comment, Review, GenreTitle, Title, Genre, Category, User)
+
+
+def snapshot():
+    return {
+        model.__name__: list(model.objects.order_by('pk').values())
+        for model in MODELS
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25ExportData:
+
+    def test_01_round_trip(self, tmp_path):
+        call_command('import_csv')
+        Title.objects.filter(pk=1).update(description='Описание')
+        before = snapshot()
+        call_command('export_data', path=str(tmp_path), chunk_size=10)
+        # Категории и жанры с одинаковым id делят строку ClassificationModel.
+        for model in (Comment, Review, GenreTitle, Title,
+                      ClassificationModel, User):
+            model.objects.all().delete()
+        call_command('import_csv', path=str(tmp_path))
+        after = snapshot()
+        for model in MODELS:
+            name = model.__name__
+            if model is User:
+                fields = ('id', 'username', 'email', 'role', 'bio')
+                before[name] = [
+                    {field: row[field] for field in fields}
+                    for row in before[name]
+                ]
+                after[name] = [
+                    {field: row[field] for field in fields}
+                    for row in after[name]
+                ]
+            assert after[name] == before[name], (
+                f'Проверьте, что выгрузка export_data таблицы {name} '
+                'загружается import_csv без изменений.'
+            )
+
+    def test_02_streaming_endpoint(self, admin_client, user_client):
+        call_command('import_csv', files=['category.csv', 'genre.csv',
+                                          'titles.csv', 'genre_title.csv'])
+        response = admin_client.get('/api/v1/export/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдается потоком.'
+        )
+        assert response['Content-Type'].startswith('text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0] == 'id,name,year,category,description,rating,genre'
+        assert len(lines) == Title.objects.count() + 1
+
+        response = admin_client.get('/api/v1/export/titles/?type=jsonl')
+        rows = [
+            json.loads(line) for line
+            in b''.join(response.streaming_content).decode().splitlines()
+        ]
+        title = Title.objects.get(pk=rows[0]['id'])
+        assert rows[0]['genre'] == list(
+            title.genre.order_by('genre_title__id')
+            .values_list('slug', flat=True)
+        )
+
+        assert admin_client.get(
+            '/api/v1/export/unknown/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert admin_client.get(
+            '/api/v1/export/titles/?type=xml'
+        ).status_code == HTTPStatus.BAD_REQUEST
+        assert user_client.get(
+            '/api/v1/export/titles/'
+        ).status_code == HTTPStatus.FORBIDDEN
@@ -0,0 +1,94 @@
+import shutil
+from multiprocessing import get_context
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from reviews.management.commands.import_csv import (get_import_order,
+                                                    make_pool, read_chunks,
+                                                    run_tasks)
+from reviews.models import Comment, GenreTitle, Review, Title, User
+
+DATA_PATH = settings.BASE_DIR / 'static' / 'data'
+
+
+def get_counts():
+    return [
+        model.objects.count()
+        for model in (Title, GenreTitle, User, Review, Comment)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ImportParallel:
+
+    def test_01_import_order(self):
+        order = get_import_order([
+            'comments.csv', 'review.csv', 'genre_title.csv', 'titles.csv',
+            'users.csv', 'genre.csv', 'category.csv',
+        ])
+        for before, after in (
+            ('category.csv', 'titles.csv'),
+            ('genre.csv', 'genre_title.csv'),
+            ('titles.csv', 'genre_title.csv'),
+            ('titles.csv', 'review.csv'),
+            ('users.csv', 'review.csv'),
+            ('review.csv', 'comments.csv'),
+        ):
+            assert order.index(before) < order.index(after), (
+                f'Проверьте, что `{before}` импортируется раньше `{after}`.'
+            )
+        assert get_import_order(['review.csv']) == ['review.csv']
+
+    def test_02_workers_give_same_result(self):
+        call_command('import_csv', batch_size=7, workers=0)
+        serial = get_counts()
+        for model in (Comment, Review, GenreTitle, Title, User):
+            model.objects.all().delete()
+        call_command(
+            'import_csv', batch_size=7, workers=2,
+            files=[
+                'titles.csv', 'genre_title.csv', 'users.csv',
+                'review.csv', 'comments.csv',
+            ],
+        )
+        assert get_counts() == serial == [32, 42, 5, 72, 3], (
+            'Проверьте, что результат импорта не зависит от количества '
+            'рабочих процессов.'
+        )
+
+    def test_03_invalid_row(self, tmp_path):
+        shutil.copy(DATA_PATH / 'category.csv', tmp_path)
+        with open(DATA_PATH / 'titles.csv', encoding='utf-8') as source:
+            lines = source.read().splitlines()
+        lines[3] = '3,Неверный год,не число,1'
+        (tmp_path / 'titles.csv').write_text(
+            '\n'.join(lines) + '\n', encoding='utf-8'
+        )
+        with pytest.raises(CommandError, match='titles.csv, запись 3'):
+            call_command(
+                'import_csv', path=str(tmp_path), workers=2,
+                files=['category.csv', 'titles.csv'],
+            )
+        assert not Title.objects.exists(), (
+            'Проверьте, что при ошибке в данных импорт не сохраняет записи.'
+        )
+
+    def test_04_spawn_workers(self):
+        tasks = [
+            ('genre.csv', number, rows)
+            for number, rows in read_chunks(DATA_PATH / 'genre.csv', 5)
+        ]
+        with make_pool(2, get_context('spawn')) as pool:
+            results = list(run_tasks(pool, tasks, 4))
+        assert sum(len(objects) for _, (objects, _) in results) == 15, (
+            'Проверьте, что рабочие процессы, запущенные через spawn, '
+            'настраивают Django перед разбором строк.'
+        )
+
+    def test_05_rate_per_file(self, capsys):
+        call_command('import_csv', workers=0, files=['genre.csv'])
+        output = capsys.readouterr().out
+        assert 'genre.csv' in output and 'Строк: 15' in output
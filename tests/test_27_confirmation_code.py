@@ -0,0 +1,124 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.codes import check_code, get_window, issue_code, make_code
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+USER_DATA = {'username': 'coder', 'email': 'coder@yamdb.fake'}
+
+
+def get_code():
+    return mail.outbox[-1].body.rsplit(' ', 1)[-1].rstrip('.')
+
+
+def count_writes(context):
+    return sum(
+        not query['sql'].lstrip().upper().startswith('SELECT')
+        for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27ConfirmationCode:
+
+    def test_01_stateless_code(self, client, django_user_model, settings):
+        settings.EMAIL_OUTBOX_ENABLED = False
+        client.post(SIGNUP_URL, data=USER_DATA)
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(SIGNUP_URL, data=USER_DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert count_writes(context) == 0, (
+            'Проверьте, что повторный запрос кода не пишет в БД.'
+        )
+        code = get_code()
+        user = django_user_model.objects.get(username='coder')
+        assert user.confirmation_code == settings.CODE_DEFAULT, (
+            'Проверьте, что код подтверждения не сохраняется в БД.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(TOKEN_URL, data={
+                'username': 'coder', 'confirmation_code': '0' * 6,
+            })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert count_writes(context) == 0, (
+            'Проверьте, что неверный код не приводит к записи в БД.'
+        )
+        response = client.post(TOKEN_URL, data={
+            'username': 'coder', 'confirmation_code': code,
+        })
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что код из письма позволяет получить токен.'
+        )
+        assert 'token' in response.json()
+        response = client.post(TOKEN_URL, data={
+            'username': 'coder', 'confirmation_code': code,
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что код подтверждения действует только один раз.'
+        )
+
+    def test_02_code_expiry(self, django_user_model, settings):
+        user = django_user_model.objects.create_user(**USER_DATA)
+        window = get_window()
+        assert check_code(user, make_code(user, window))
+        assert check_code(user, make_code(user, window - 1))
+        assert not check_code(user, make_code(user, window - 2)), (
+            'Проверьте, что код перестает действовать после окончания '
+            'следующего окна времени.'
+        )
+        code = make_code(user, window)
+        user.email = 'other@yamdb.fake'
+        assert not check_code(user, code), (
+            'Проверьте, что смена email делает код недействительным.'
+        )
+        assert len(code) == settings.CODE_LENGHT
+
+    def test_03_attempt_limit(self, django_user_model, settings):
+        settings.CONFIRMATION_CODE_MAX_ATTEMPTS = 3
+        user = django_user_model.objects.create_user(**USER_DATA)
+        code = issue_code(user)
+        wrong = '1' * 6 if code != '1' * 6 else '2' * 6
+        for _ in range(3):
+            assert not check_code(user, wrong)
+        user = django_user_model.objects.get(pk=user.pk)
+        assert not check_code(user, code), (
+            'Проверьте, что после исчерпания попыток выданный код сгорает.'
+        )
+        assert not check_code(user, issue_code(user)), (
+            'Проверьте, что после исчерпания попыток проверка кодов '
+            'блокируется.'
+        )
+
+    def test_04_concurrent_use(self, django_user_model):
+        user = django_user_model.objects.create_user(**USER_DATA)
+        code = issue_code(user)
+        first = django_user_model.objects.get(pk=user.pk)
+        second = django_user_model.objects.get(pk=user.pk)
+        assert check_code(first, code)
+        assert not check_code(second, code), (
+            'Проверьте, что один код не выдает токен двум одновременным '
+            'запросам.'
+        )
+
+    def test_05_stored_code(self, client, django_user_model, settings):
+        settings.EMAIL_OUTBOX_ENABLED = False
+        settings.CONFIRMATION_CODE_STATELESS = False
+        client.post(SIGNUP_URL, data=USER_DATA)
+        code = get_code()
+        user = django_user_model.objects.get(username='coder')
+        assert user.confirmation_code == code
+        client.post(TOKEN_URL, data={
+            'username': 'coder', 'confirmation_code': 'wrong',
+        })
+        response = client.post(TOKEN_URL, data={
+            'username': 'coder', 'confirmation_code': code,
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что хранимый код сбрасывается после неверной попытки.'
+        )
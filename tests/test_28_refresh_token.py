@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from api.tokens import get_token_pair
+
+REFRESH_URL = '/api/v1/auth/token/refresh/'
+
+
+def post_refresh(client, refresh):
+    return client.post(
+        REFRESH_URL, data=f'{{"refresh": "{refresh}"}}',
+        content_type='application/json',
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28RefreshToken:
+
+    def test_01_refresh_rotation(self, client, user):
+        tokens = get_token_pair(user)
+        with CaptureQueriesContext(connection) as context:
+            response = post_refresh(client, tokens['refresh'])
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{REFRESH_URL}` с действующим '
+            'refresh-токеном возвращает ответ со статусом 200.'
+        )
+        assert not context.captured_queries, (
+            'Проверьте, что обновление токена не обращается к БД.'
+        )
+        data = response.json()
+        assert set(data) == {'token', 'refresh'}
+        assert data['refresh'] != tokens['refresh']
+
+        response = client.get(
+            '/api/v1/users/me/', HTTP_AUTHORIZATION=f'Bearer {data["token"]}'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый токен позволяет авторизоваться.'
+        )
+
+        response = post_refresh(client, tokens['refresh'])
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что использованный refresh-токен отзывается.'
+        )
+        assert post_refresh(
+            client, data['refresh']
+        ).status_code == HTTPStatus.OK
+
+    def test_02_invalid_refresh(self, client, user):
+        tokens = get_token_pair(user)
+        assert post_refresh(
+            client, tokens['token']
+        ).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что access-токен не принимается вместо refresh-токена.'
+        )
+        assert post_refresh(client, 'broken').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        response = client.post(REFRESH_URL)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_without_rotation(self, client, user, monkeypatch):
+        monkeypatch.setattr(jwt_settings, 'ROTATE_REFRESH_TOKENS', False)
+        tokens = get_token_pair(user)
+        for _ in range(2):
+            response = post_refresh(client, tokens['refresh'])
+            assert response.status_code == HTTPStatus.OK
+            assert set(response.json()) == {'token'}, (
+                'Проверьте, что без ротации refresh-токен не перевыпускается.'
+            )
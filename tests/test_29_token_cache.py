@@ -0,0 +1,71 @@
+from http import HTTPStatus
+from time import time
+
+import pytest
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from api.authentication import verified_tokens
+
+URL = '/api/v1/categories/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29TokenCache:
+
+    def test_01_repeat_token_skips_verification(self, user_client,
+                                                monkeypatch):
+        verified_tokens.clear()
+        calls = []
+        validate = JWTAuthentication.get_validated_token
+
+        def counting_validate(self, raw_token):
+            calls.append(raw_token)
+            return validate(self, raw_token)
+
+        monkeypatch.setattr(
+            JWTAuthentication, 'get_validated_token', counting_validate
+        )
+        for _ in range(3):
+            assert user_client.get(URL).status_code == HTTPStatus.OK
+        assert len(calls) == 1, (
+            'Проверьте, что повторный запрос с тем же токеном не проверяет '
+            'подпись токена заново.'
+        )
+        stats = verified_tokens.get_stats()
+        assert (stats['hits'], stats['misses'], stats['size']) == (2, 1, 1)
+
+    def test_02_expired_and_evicted(self, user_client, admin_client,
+                                    settings):
+        verified_tokens.clear()
+        user_client.get(URL)
+        key = next(iter(verified_tokens.tokens))
+        token, _ = verified_tokens.tokens[key]
+        verified_tokens.tokens[key] = (token, time() - 1)
+        assert verified_tokens.get(key) is None, (
+            'Проверьте, что истекший токен не возвращается из кеша.'
+        )
+        assert not verified_tokens.tokens
+
+        settings.AUTH_TOKEN_CACHE_SIZE = 1
+        user_client.get(URL)
+        admin_client.get(URL)
+        assert len(verified_tokens.tokens) == 1, (
+            'Проверьте, что размер кеша ограничен AUTH_TOKEN_CACHE_SIZE.'
+        )
+
+    def test_03_stats_endpoint(self, user_client, admin_client):
+        url = '/api/v1/stats/tokens/'
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()) == {'hits', 'misses', 'size', 'max_size'}
+
+    def test_04_invalid_token(self, client):
+        verified_tokens.clear()
+        response = client.get(
+            '/api/v1/users/me/', HTTP_AUTHORIZATION='Bearer broken'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert not verified_tokens.tokens, (
+            'Проверьте, что в кеш попадают только проверенные токены.'
+        )
@@ -0,0 +1,141 @@
+from http import HTTPStatus
+
+import pytest
+
+from api import throttling
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+@pytest.fixture
+def rates(settings):
+    def set_rates(**scopes):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'],
+                **scopes,
+            },
+        }
+    return set_rates
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30Throttling:
+
+    def test_01_signup(self, client, rates):
+        rates(signup='3/min')
+        for number in range(3):
+            response = client.post(SIGNUP_URL, data={
+                'username': f'user{number}',
+                'email': f'user{number}@yamdb.fake',
+            })
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(SIGNUP_URL, data={
+            'username': 'user3', 'email': 'user3@yamdb.fake',
+        })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частота запросов к `{SIGNUP_URL}` с одного '
+            'адреса ограничена.'
+        )
+        assert int(response['Retry-After']) > 0
+
+    def test_02_spoofed_forwarded_for(self, client, rates):
+        rates(signup='2/min')
+        statuses = [
+            client.post(SIGNUP_URL, data={
+                'username': f'user{number}',
+                'email': f'user{number}@yamdb.fake',
+            }, HTTP_X_FORWARDED_FOR=f'10.0.0.{number}').status_code
+            for number in range(3)
+        ]
+        assert statuses[-1] == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что подмена заголовка X-Forwarded-For не обходит '
+            'ограничение частоты запросов.'
+        )
+
+    def test_03_token_attempts_per_username(self, client, user, rates):
+        rates(token='2/min')
+        data = {'username': user.username, 'confirmation_code': '000000'}
+        for _ in range(2):
+            assert client.post(TOKEN_URL, data=data).status_code == (
+                HTTPStatus.BAD_REQUEST
+            )
+        response = client.post(TOKEN_URL, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что попытки получить токен для одного пользователя '
+            'ограничены.'
+        )
+        response = client.post(TOKEN_URL, data={
+            'username': 'other', 'confirmation_code': '000000',
+        })
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что ограничение попыток действует для каждого имени '
+            'пользователя отдельно.'
+        )
+
+    def test_04_review_writes(self, admin_client, user_client, rates):
+        titles, _, _ = create_titles(admin_client)
+        rates(review_write='2/min')
+        review_id = create_single_review(
+            user_client, titles[0]['id'], 'text', 5
+        ).json()['id']
+        create_single_comment(user_client, titles[0]['id'], review_id, 'ok')
+        response = user_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'text', 'score': 5},
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что создание отзывов и комментариев одним '
+            'пользователем ограничено.'
+        )
+        response = user_client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что чтение отзывов не ограничивается.'
+        )
+        response = admin_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'text', 'score': 5},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_05_bucket_refill(self, rates, monkeypatch):
+        rates(signup='2/min')
+        clock = [1000.0]
+        monkeypatch.setattr(throttling, 'time', lambda: clock[0])
+
+        class Request:
+            META = {'REMOTE_ADDR': '10.0.0.1'}
+
+        def allow():
+            return throttling.SignupThrottle().allow_request(Request, None)
+
+        assert [allow() for _ in range(3)] == [True, True, False]
+        clock[0] += 29
+        assert not allow()
+        clock[0] += 1
+        assert allow(), (
+            'Проверьте, что ведро пополняется на один запрос каждые '
+            'duration / num_requests секунд.'
+        )
+        assert not allow(), (
+            'Проверьте, что отклоненные запросы не расходуют ведро.'
+        )
+        clock[0] += 60
+        assert [allow() for _ in range(3)] == [True, True, False]
+
+    def test_06_token_body_not_object(self, client, rates):
+        rates(token='10/min')
+        for body in ('[]', '"username"'):
+            response = client.post(
+                TOKEN_URL, data=body, content_type='application/json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что запрос токена с телом, которое не является '
+                'объектом, возвращает ответ со статусом 400.'
+            )
@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+
+API_URL = '/api/v1/categories/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31LeanMiddleware:
+
+    def test_01_api_skips_session_and_csrf(self, user_client):
+        response = user_client.get(API_URL)
+        assert response.status_code == HTTPStatus.OK
+        request = response.wsgi_request
+        assert not hasattr(request, 'session'), (
+            'Проверьте, что для путей API не работает middleware сессий.'
+        )
+        assert not hasattr(request, '_messages'), (
+            'Проверьте, что для путей API не работает middleware сообщений.'
+        )
+        assert 'CSRF_COOKIE' not in request.META, (
+            'Проверьте, что для путей API не работает middleware CSRF.'
+        )
+        assert response['X-Frame-Options'] == 'DENY'
+
+        response = user_client.get(API_URL, HTTP_ACCEPT='text/html')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что Browsable API работает без middleware сессий.'
+        )
+
+    def test_02_admin_keeps_session_and_csrf(self, django_user_model):
+        admin = django_user_model.objects.create_superuser(
+            username='superuser', email='superuser@yamdb.fake',
+            password='1234567',
+        )
+        client = Client(enforce_csrf_checks=True)
+        response = client.get('/admin/login/')
+        assert response.status_code == HTTPStatus.OK
+        assert hasattr(response.wsgi_request, 'session')
+        response = client.post('/admin/login/', data={
+            'username': admin.username, 'password': '1234567',
+        })
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что для админки проверяется CSRF-токен.'
+        )
+        csrf_token = client.get('/admin/login/').context['csrf_token']
+        response = client.post('/admin/login/', data={
+            'username': admin.username, 'password': '1234567',
+            'csrfmiddlewaretoken': str(csrf_token),
+        })
+        assert response.status_code == HTTPStatus.FOUND, (
+            'Проверьте, что вход в админку работает через сессию.'
+        )
+        assert client.get('/admin/').status_code == HTTPStatus.OK